@@ -7,6 +7,8 @@ class ArchesControlledListsConfig(AppConfig):
     is_arches_application = True
 
     def ready(self):
+        from arches_controlled_lists import signals  # noqa: F401
+
         if apps.get_app_config("arches_querysets"):
             from arches_controlled_lists.datatypes.datatypes import (
                 ReferenceField,
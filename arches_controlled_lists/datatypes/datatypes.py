@@ -1,8 +1,9 @@
+import time
 import uuid
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from typing import Iterable, Mapping
 
-from django.db.models import F, JSONField
+from django.db.models import JSONField
 from django.utils.translation import gettext as _
 
 from arches.app.datatypes.base import BaseDataType
@@ -14,6 +15,7 @@ from arches.app.search.elasticsearch_dsl_builder import (
 )
 
 from arches_controlled_lists.models import ListItem
+from arches_controlled_lists.utils.label_lookup import lookup_list_item_ids
 
 try:
     import rest_framework.fields
@@ -29,7 +31,7 @@ else:
 class ReferenceField(JSONField): ...
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ReferenceLabel:
     id: uuid.UUID
     value: str
@@ -37,29 +39,67 @@ class ReferenceLabel:
     valuetype_id: str
     list_item_id: uuid.UUID
 
+    def to_dict(self):
+        """Like `dataclasses.asdict()`, without its recursive deep copy."""
+        return {
+            "id": self.id,
+            "value": self.value,
+            "language_id": self.language_id,
+            "valuetype_id": self.valuetype_id,
+            "list_item_id": self.list_item_id,
+        }
+
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Reference:
     uri: str
     labels: list[ReferenceLabel]
     list_id: uuid.UUID
 
+    def to_dict(self):
+        """Like `dataclasses.asdict()`, without its recursive deep copy."""
+        return {
+            "uri": self.uri,
+            "labels": [label.to_dict() for label in self.labels],
+            "list_id": self.list_id,
+        }
+
+
+# Reference settings of node configs by node id, for validation, with the
+# time they expire. Saves in this process clear them at once (see signals.py);
+# saves in other processes are seen once they expire.
+_node_configs: dict[str, tuple[float, dict | None]] = {}
+NODE_CONFIG_TTL = 60
+
+
+def clear_node_configs(**kwargs):
+    _node_configs.clear()
+
 
 class ReferenceDataType(BaseDataType):
     model_field = ReferenceField(null=True)
 
     def to_python(
-        self, value: Iterable[Mapping] | None, **kwargs
+        self, value: Iterable[Mapping | Reference] | None, **kwargs
     ) -> list[Reference] | None:
         if not value:
             return None
 
         references = []
         for reference in value:
+            # Already parsed, e.g. by an earlier call.
+            if isinstance(reference, Reference):
+                references.append(reference)
+                continue
             incoming_args = {**reference}
             if labels := incoming_args.get("labels"):
                 incoming_args["labels"] = [
-                    ReferenceLabel(**label) for label in incoming_args["labels"]
+                    (
+                        label
+                        if isinstance(label, ReferenceLabel)
+                        else ReferenceLabel(**label)
+                    )
+                    for label in labels
                 ]
             elif labels == []:
                 incoming_args.pop("labels")
@@ -75,7 +115,7 @@ class ReferenceDataType(BaseDataType):
         if value is None:
             return None
         return [
-            asdict(reference) if isinstance(reference, Reference) else {**reference}
+            reference.to_dict() if isinstance(reference, Reference) else {**reference}
             for reference in value
         ]
 
@@ -120,19 +160,53 @@ class ReferenceDataType(BaseDataType):
                 msg = _("Found multiple list items among labels: {reference}")
                 raise ValueError(msg)
 
+    def validate_many(self, values, node=None, nodeid=None, **kwargs):
+        """Validates values for one node, returning the errors for each value
+        as `validate()` would. The node's config is read once, from the
+        database rather than the cache, so a batch never sees a stale one."""
+        if node is None and nodeid:
+            self.get_node_config(nodeid, refresh=True)
+        return [
+            self.validate(value, node=node, nodeid=nodeid, **kwargs) for value in values
+        ]
+
     def validate_multivalue(self, parsed: list[Reference] | None, node, nodeid):
         if not parsed:
             return
-        if not node:
-            if not nodeid:
-                raise ValueError
-            try:
-                node = Node.objects.get(nodeid=nodeid)
-            except Node.DoesNotExist:
-                return
-        if not node.config.get("multiValue") and len(parsed) > 1:
+        if node:
+            config = node.config
+        elif not nodeid:
+            raise ValueError
+        elif (config := self.get_node_config(nodeid)) is None:
+            return
+        if not config.get("multiValue") and len(parsed) > 1:
             raise ValueError(_("This node does not allow multiple references."))
 
+    @staticmethod
+    def get_node_config(nodeid, refresh=False) -> dict | None:
+        """Returns the reference settings of a node's config, or None if there
+        is no such node, from a per-process cache of `NODE_CONFIG_TTL`
+        seconds. Pass `refresh` to read the config from the database."""
+        key = str(nodeid)
+        now = time.monotonic()
+        expires, reference_config = _node_configs.get(key, (now, None))
+        if refresh or expires <= now:
+            config = (
+                Node.objects.filter(nodeid=nodeid)
+                .values_list("config", flat=True)
+                .first()
+            )
+            reference_config = (
+                None
+                if config is None
+                else {
+                    "multiValue": config.get("multiValue"),
+                    "controlledList": config.get("controlledList"),
+                }
+            )
+            _node_configs[key] = (now + NODE_CONFIG_TTL, reference_config)
+        return reference_config
+
     @staticmethod
     def transform_exception(e):
         message = _("Unknown error")
@@ -155,58 +229,94 @@ class ReferenceDataType(BaseDataType):
         }
 
     def transform_value_for_tile(self, value, **kwargs):
+        return self.transform_values_for_tile([value], **kwargs)[0]
+
+    def transform_values_for_tile(self, values, **kwargs):
+        """Transforms a column of incoming values, each as accepted by
+        `transform_value_for_tile()`, into tile values in a constant number of
+        queries: list items given by label are looked up together, then all
+        list items are fetched together with their labels."""
+        parsed_values = [self.parse_incoming_value(value) for value in values]
+
+        labels = {
+            single_value
+            for parsed in parsed_values
+            for single_value in parsed or []
+            if isinstance(single_value, str)
+        }
+        item_ids_by_label = self.lookup_listitem_ids_from_labels(
+            labels, kwargs.get("controlledList")
+        )
+        item_ids = set(item_ids_by_label.values())
+        for parsed in parsed_values:
+            for single_value in parsed or []:
+                if isinstance(single_value, uuid.UUID):
+                    item_ids.add(single_value)
+        tile_values_by_item_id = {
+            item.pk: item.build_tile_value()
+            for item in ListItem.objects.filter(pk__in=item_ids).with_list_item_labels()
+        }
+
+        final_values = []
+        for parsed in parsed_values:
+            if parsed is None:
+                final_values.append(None)
+                continue
+            final_tile_values = []
+            for single_value in parsed:
+                if isinstance(single_value, Reference):
+                    final_tile_values.append(single_value.to_dict())
+                    continue
+                if isinstance(single_value, str):
+                    single_value = item_ids_by_label.get(single_value)
+                if tile_value := tile_values_by_item_id.get(single_value):
+                    final_tile_values.append(tile_value)
+            final_values.append(final_tile_values)
+        return final_values
+
+    @staticmethod
+    def parse_incoming_value(value) -> list[Reference | uuid.UUID | str] | None:
+        """Splits an incoming value into references, list item ids, and
+        labels of list items."""
         if value is None:
             return None
         if not isinstance(value, list):
             value = [val.strip() for val in value.split(",")]
 
-        # Pre-process to discard display values generated by to_json().
-        pre_processed_values = []
+        parsed = []
         for single_value in value:
+            # Discard display values generated by to_json().
             if isinstance(single_value, dict) and (
                 list_item_id := single_value.get("list_item_id")
             ):
-                pre_processed_values.append(list_item_id)
-            else:
-                pre_processed_values.append(single_value)
-
-        final_tile_values = []
-        for single_value in pre_processed_values:
-            found_item: ListItem | Reference | None = None
+                single_value = list_item_id
             match single_value:
-                case Reference():
-                    found_item = single_value
-                case uuid.UUID():
-                    found_item = ListItem.objects.filter(pk=list_item_id).first()
+                case Reference() | uuid.UUID():
+                    parsed.append(single_value)
                 case str():
                     try:
-                        list_item_id = uuid.UUID(single_value)
+                        parsed.append(uuid.UUID(single_value))
                     except ValueError:
-                        list_id = kwargs.get("controlledList")
-                        found_item = self.lookup_listitem_from_label(
-                            single_value, list_id
-                        )
-                    else:
-                        found_item = ListItem.objects.filter(pk=list_item_id).first()
+                        parsed.append(single_value)
                 case _:
                     raise TypeError(type(single_value))
-
-            if found_item:
-                if isinstance(found_item, Reference):
-                    final_tile_values.append(asdict(found_item))
-                else:
-                    final_tile_values.append(found_item.build_tile_value())
-
-        return final_tile_values
-
-    def lookup_listitem_from_label(self, value, list_id):
-        if not value or not list_id:
+        return parsed
+
+    def lookup_listitem_ids_from_labels(self, values, list_id, language=None):
+        """Returns a mapping of value to the id of the item in the list having
+        that label, preferring items nearer the root, then lower sortorders.
+        Labels are matched exactly if possible, else ignoring case and
+        diacritics. See `ListItemLabelIndex`."""
+        values = {value for value in values if value}
+        if not values or not list_id:
+            return {}
+        return lookup_list_item_ids(list_id, values, language)
+
+    def lookup_listitem_from_label(self, value, list_id, language=None):
+        item_ids = self.lookup_listitem_ids_from_labels([value], list_id, language)
+        if value not in item_ids:
             return None
-        return (
-            ListItem.objects.filter(list_id=list_id, list_item_values__value=value)
-            .order_by(F("parent").asc(nulls_first=True), "sortorder")
-            .first()
-        )
+        return ListItem.objects.filter(pk=item_ids[value]).first()
 
     def clean(self, tile, nodeid):
         super().clean(tile, nodeid)
@@ -260,11 +370,10 @@ class ReferenceDataType(BaseDataType):
                         if item_id := item["labels"][0].get("list_item_id"):
                             list_item_ids.add(item_id)
 
-        return (
-            ListItem.objects.filter(id__in=list_item_ids)
-            .with_list_item_labels()
-            .prefetch_related("children")
-        )
+        return {
+            item.pk: item
+            for item in ListItem.objects.filter(id__in=list_item_ids).fetch_subtrees()
+        }
 
     def get_details(self, value, *, datatype_context=None, **kwargs):
         """
@@ -328,30 +437,27 @@ class ReferenceDataType(BaseDataType):
         else:
             return None
 
+        # The datatype_context maps item ids to items with fetched subtrees,
+        # see get_display_value_context_in_bulk().
         if datatype_context is None:
-            datatype_context = []
+            datatype_context = {}
         # Get as many items from the datatypes_context as possible ...
         transformed_items = [
-            item.build_select_option()
-            for item in datatype_context
-            if item.pk in list_item_ids
+            datatype_context[item_id].build_select_option()
+            for item_id in list_item_ids
+            if item_id in datatype_context
         ]
         # ... and fetch the rest.
         remaining_ids_to_fetch = [
-            item_id
-            for item_id in list_item_ids
-            if ListItem(pk=item_id) not in datatype_context
-        ]
-        items_to_fetch = (
-            ListItem.objects.filter(id__in=remaining_ids_to_fetch)
-            .with_list_item_labels()
-            .prefetch_related("children")
-        )
-        remaining_transformed_items = [
-            item.build_select_option() for item in items_to_fetch
+            item_id for item_id in list_item_ids if item_id not in datatype_context
         ]
+        if remaining_ids_to_fetch:
+            items_to_fetch = ListItem.objects.filter(
+                id__in=remaining_ids_to_fetch
+            ).fetch_subtrees()
+            transformed_items += [item.build_select_option() for item in items_to_fetch]
 
-        return transformed_items + remaining_transformed_items
+        return transformed_items
 
     def collects_multiple_values(self):
         return True
@@ -376,26 +482,44 @@ class ReferenceDataType(BaseDataType):
             )
 
     def append_to_document(self, document, nodevalue, nodeid, tile, provisional=False):
+        """Adds one nested reference per distinct reference, with the ids of
+        its labels, and each distinct label once to the document strings."""
         if "references" not in document:
             document["references"] = []
+        indexed = {
+            (ref["uri"], ref["list_id"], ref["nodegroup_id"], ref["provisional"])
+            for ref in document["references"]
+        }
+        strings = {}
         for reference in self.get_nodevalues(nodevalue):
-            for label in reference["labels"]:
+            key = (
+                reference["uri"],
+                reference["list_id"],
+                tile.nodegroup_id,
+                provisional,
+            )
+            if key not in indexed:
+                indexed.add(key)
                 document["references"].append(
                     {
-                        "id": label["id"],
+                        "label_ids": [label["id"] for label in reference["labels"]],
                         "uri": reference["uri"],
                         "list_id": reference["list_id"],
                         "nodegroup_id": tile.nodegroup_id,
                         "provisional": provisional,
                     }
                 )
-                document["strings"].append(
-                    {
-                        "string": label["value"],
-                        "nodegroup_id": tile.nodegroup_id,
-                        "provisional": provisional,
-                    }
-                )
+            strings.update(
+                dict.fromkeys(label["value"] for label in reference["labels"])
+            )
+        for string in strings:
+            document["strings"].append(
+                {
+                    "string": string,
+                    "nodegroup_id": tile.nodegroup_id,
+                    "provisional": provisional,
+                }
+            )
 
     def append_search_filters(self, value, node, query, request):
         # value["val"] is expected to be a list slimmed reference dictionaries:
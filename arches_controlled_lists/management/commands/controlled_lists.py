@@ -14,7 +14,7 @@ from arches.app.models.models import (
     Value,
     Widget,
 )
-from arches_controlled_lists.models import List
+from arches_controlled_lists.models import List, ListChange, ListItem
 
 
 class Command(BaseCommand):
@@ -176,6 +176,16 @@ class Command(BaseCommand):
                 [collections_in_db, host, overwrite, preferred_sort_language],
             )
             result = cursor.fetchone()
+            # Items inserted by the postgres function lack hierarchy columns.
+            migrated_items = ListItem.objects.filter(sort_path__isnull=True)
+            List.objects.filter(list_items__in=migrated_items).bump_revision(
+                [
+                    (list_id, "listitem", item_id, ListChange.Action.INSERT)
+                    for item_id, list_id in migrated_items.values_list("pk", "list_id")
+                ]
+            )
+            migrated_items.refresh_best_labels()
+            migrated_items.refresh_hierarchy()
             self.stdout.write(result[0])
 
     def migrate_concept_nodes_to_reference_datatype(self, graph):
@@ -277,14 +287,27 @@ class Command(BaseCommand):
                             new_default_value = []
                             if isinstance(original_default_value, str):
                                 original_default_value = [original_default_value]
-                            for value in original_default_value:
-                                value_rec = Value.objects.get(pk=value)
-                                config = {"controlledList": node.collection_id}
-                                new_value = REFERENCE_FACTORY.transform_value_for_tile(
-                                    value=value_rec.value,
-                                    **config,
+                            value_recs = Value.objects.in_bulk(original_default_value)
+                            missing_values = [
+                                value
+                                for value in original_default_value
+                                if UUID(value) not in value_recs
+                            ]
+                            if missing_values:
+                                raise CommandError(
+                                    f"Original default value(s) {', '.join(missing_values)} for node: {node.name} do not exist"
                                 )
-                                if isinstance(new_value, list):
+                            value_recs = [
+                                value_recs[UUID(value)]
+                                for value in original_default_value
+                            ]
+                            config = {"controlledList": node.collection_id}
+                            new_values = REFERENCE_FACTORY.transform_values_for_tile(
+                                [value_rec.value for value_rec in value_recs],
+                                **config,
+                            )
+                            for value_rec, new_value in zip(value_recs, new_values):
+                                if new_value:
                                     new_default_value.append(new_value[0])
                                 else:
                                     raise CommandError(
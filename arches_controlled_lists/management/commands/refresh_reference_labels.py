@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.exceptions import ValidationError
+
+from arches_controlled_lists.utils.reference_labels import refresh_reference_labels
+
+
+class Command(BaseCommand):
+    """
+    Rewrites the labels stored in reference tile values with the current labels
+    of their list items, and reindexes the resources whose tiles changed
+
+    Example usage:
+        python manage.py refresh_reference_labels
+        python manage.py refresh_reference_labels --list <list id>
+        python manage.py refresh_reference_labels --item <item id> <item id>
+
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-l",
+            "--list",
+            action="store",
+            dest="list_ids",
+            nargs="*",
+            help="Refresh references to items of these lists. Default all lists",
+        )
+
+        parser.add_argument(
+            "-i",
+            "--item",
+            action="store",
+            dest="item_ids",
+            nargs="*",
+            help="Refresh references to these list items",
+        )
+
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            action="store",
+            dest="batch_size",
+            type=int,
+            default=1000,
+            help="Number of tiles rewritten per statement. Default 1000",
+        )
+
+        parser.add_argument(
+            "--skip-indexing",
+            action="store_true",
+            dest="skip_indexing",
+            help="Do not reindex the resources whose tiles were rewritten",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            summary = refresh_reference_labels(
+                list_item_ids=options["item_ids"] or None,
+                list_ids=options["list_ids"] or None,
+                batch_size=options["batch_size"],
+                reindex=not options["skip_indexing"],
+            )
+        except ValidationError as e:
+            raise CommandError(e)
+
+        rate = summary["tiles"] / summary["seconds"] if summary["seconds"] else 0
+        self.stdout.write(
+            "Refreshed labels of {0:,} list items in {1:,} tiles of {2:,} "
+            "resources in {3:.2f}s ({4:,.0f} tiles/s)".format(
+                summary["items"],
+                summary["tiles"],
+                summary["resources"],
+                summary["seconds"],
+                rate,
+            )
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:51
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+populate_sort_path = """
+    WITH RECURSIVE ancestry AS (
+        SELECT id AS descendant_id, parent_id, sortorder, 0 AS depth
+        FROM arches_controlled_lists_listitem
+        UNION ALL
+        SELECT ancestry.descendant_id, parent.parent_id, parent.sortorder, ancestry.depth + 1
+        FROM ancestry
+        JOIN arches_controlled_lists_listitem parent ON parent.id = ancestry.parent_id
+        WHERE ancestry.depth < 1000
+    )
+    UPDATE arches_controlled_lists_listitem SET sort_path = paths.sort_path
+    FROM (
+        SELECT descendant_id, array_agg(sortorder ORDER BY depth DESC) AS sort_path
+        FROM ancestry GROUP BY descendant_id
+    ) paths
+    WHERE arches_controlled_lists_listitem.id = paths.descendant_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_controlled_lists", "0008_ensure_languages_in_sync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listitem",
+            name="sort_path",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), editable=False, null=True, size=None
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listitem",
+            index=models.Index(
+                fields=["list", "sort_path"], name="listitem_list_sort_path"
+            ),
+        ),
+        migrations.RunSQL(populate_sort_path, migrations.RunSQL.noop),
+    ]
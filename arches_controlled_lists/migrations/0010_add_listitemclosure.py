@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+populate_closure = """
+    WITH RECURSIVE ancestry AS (
+        SELECT id AS ancestor_id, id AS descendant_id, parent_id, 0 AS depth
+        FROM arches_controlled_lists_listitem
+        UNION ALL
+        SELECT parent.id, ancestry.descendant_id, parent.parent_id, ancestry.depth + 1
+        FROM ancestry
+        JOIN arches_controlled_lists_listitem parent ON parent.id = ancestry.parent_id
+        WHERE ancestry.depth < 1000
+    )
+    INSERT INTO arches_controlled_lists_listitemclosure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, depth FROM ancestry;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_controlled_lists", "0009_add_listitem_sort_path"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListItemClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="arches_controlled_lists.listitem",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="arches_controlled_lists.listitem",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "depth"],
+                        name="listitemclosure_descendant",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ancestor", "descendant"),
+                        name="unique_ancestor_descendant",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(populate_closure, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_controlled_lists", "0010_add_listitemclosure"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE SEQUENCE arches_controlled_lists_revision_seq;",
+            "DROP SEQUENCE arches_controlled_lists_revision_seq;",
+        ),
+        migrations.AddField(
+            model_name="list",
+            name="revision",
+            field=models.PositiveBigIntegerField(
+                db_default=models.Func(
+                    output_field=models.PositiveBigIntegerField(),
+                    template="nextval('arches_controlled_lists_revision_seq')",
+                ),
+                editable=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_controlled_lists", "0011_add_list_revision"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListChange",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("list_id", models.UUIDField()),
+                ("revision", models.PositiveBigIntegerField()),
+                ("model", models.CharField(max_length=63)),
+                ("object_id", models.UUIDField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("insert", "Insert"),
+                            ("update", "Update"),
+                            ("delete", "Delete"),
+                            ("move", "Move"),
+                        ],
+                        max_length=6,
+                    ),
+                ),
+                ("timestamp", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["list_id", "revision"], name="listchange_list_revision"
+                    )
+                ],
+            },
+        ),
+    ]
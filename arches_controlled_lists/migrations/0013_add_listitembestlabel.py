@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:11
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from arches.app.utils.i18n import rank_label
+
+
+def populate_best_labels(apps, schema_editor):
+    """Mirrors ListItemQuerySet.refresh_best_labels() over every item."""
+    Language = apps.get_model("models", "Language")
+    ListItemValue = apps.get_model("arches_controlled_lists", "ListItemValue")
+    ListItemBestLabel = apps.get_model("arches_controlled_lists", "ListItemBestLabel")
+
+    labels_by_item = defaultdict(list)
+    for label in ListItemValue.objects.filter(valuetype__category="label").iterator():
+        labels_by_item[label.list_item_id].append(label)
+    languages = Language.objects.values_list("code", flat=True)
+
+    ListItemBestLabel.objects.bulk_create(
+        (
+            ListItemBestLabel(
+                list_item_id=item_id,
+                language_id=language,
+                value=max(
+                    labels,
+                    key=lambda label: rank_label(
+                        kind=label.valuetype_id,
+                        source_lang=label.language_id,
+                        target_lang=language,
+                    ),
+                ).value,
+            )
+            for item_id, labels in labels_by_item.items()
+            for language in languages
+        ),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_controlled_lists", "0012_add_listchange"),
+        ("models", "12009_language_single_default_language"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListItemBestLabel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.TextField()),
+                (
+                    "language",
+                    models.ForeignKey(
+                        db_column="languageid",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="models.language",
+                        to_field="code",
+                    ),
+                ),
+                (
+                    "list_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="best_labels",
+                        to="arches_controlled_lists.listitem",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("list_item", "language"),
+                        name="unique_item_best_label_language",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_best_labels, migrations.RunPython.noop),
+    ]
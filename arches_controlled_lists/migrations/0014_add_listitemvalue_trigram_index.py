@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:13
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_controlled_lists", "0013_add_listitembestlabel"),
+        ("models", "12009_language_single_default_language"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="listitemvalue",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("value"), name="gin_trgm_ops"
+                ),
+                name="listitemvalue_value_trgm",
+            ),
+        ),
+    ]
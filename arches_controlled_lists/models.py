@@ -7,26 +7,32 @@ from typing import Iterable, TYPE_CHECKING
 
 from django.conf import settings
 from django.contrib.postgres.constraints import ExclusionConstraint
-from django.contrib.postgres.fields import RangeOperators
+from django.contrib.postgres.fields import ArrayField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
 from django.db.models import Deferrable, Q
+from django.db.models.functions import Upper
 from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 
 from arches.app.models.models import DValueType, Language, Node
+from arches.app.models.fields.i18n import I18n_String
 from arches.app.models.utils import field_names
 from arches.app.search.elasticsearch_dsl_builder import Term, Query
 from arches.app.search.search_engine_factory import SearchEngineInstance
 from arches.app.utils.file_validator import FileValidator
 from arches.app.utils.i18n import rank_label
 from arches_controlled_lists.querysets import (
+    HIERARCHY_FIELDS,
     ListQuerySet,
     ListItemQuerySet,
     ListItemImageManager,
+    ListItemImageMetadataQuerySet,
     ListItemValueQuerySet,
     NodeQuerySet,
+    next_revision,
 )
 
 if TYPE_CHECKING:
@@ -38,6 +44,10 @@ class List(models.Model):
     name = models.CharField(max_length=127, null=False, blank=True)
     dynamic = models.BooleanField(default=False)
     searchable = models.BooleanField(default=False)
+    # Advanced by every write to the list or its contents (see `bump_revision`).
+    revision = models.PositiveBigIntegerField(
+        db_default=next_revision(), editable=False
+    )
 
     objects = ListQuerySet.as_manager()
 
@@ -53,95 +63,154 @@ class List(models.Model):
 
     def delete(self, *args, **kwargs):
         pk = self.pk
-        super().delete(*args, **kwargs)
+        with transaction.atomic():
+            super().delete(*args, **kwargs)
+            ListChange.for_deleted_list(pk).save()
         self.delete_index(pk=pk)
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        action = ListChange.Action.INSERT if adding else ListChange.Action.UPDATE
+        if not adding:
+            # Only bump_revision() writes the revision, which may be stale here.
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key
+                ]
+            kwargs["update_fields"] = [
+                field for field in update_fields if field != "revision"
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # An empty update_fields writes nothing, so there is nothing to bump.
+            if kwargs.get("update_fields", True):
+                List.objects.filter(pk=self.pk).bump_revision(
+                    [(self.pk, "list", self.pk, action)]
+                )
+                self.refresh_from_db(fields=["revision"])
         if self.searchable:
             self.index()
         else:
             self.delete_index()
 
-    def serialize(self, depth_map=None, flat=False, permitted_nodegroups=None):
-        if depth_map is None:
-            depth_map = defaultdict(int)
-        if flat:
-            list_items_lookup = {str(item.pk): item for item in self.list_items.all()}
-
-            def get_path(item):
-                parent_id = item["parent_id"]
-                path = [item["id"]]
-                loop_breaker = 0
-                while parent_id and loop_breaker < 1000:
-                    path.insert(0, parent_id)
-                    if parent_id := list_items_lookup[parent_id].parent_id:
-                        parent_id = str(parent_id)
-                    loop_breaker += 1
-                return path
-
-            sort_fn = lambda item: (
-                tuple(
-                    list_items_lookup[item_in_path].sortorder
-                    for item_in_path in get_path(item)
-                )
-            )
-        else:
-            sort_fn = lambda item: item["sortorder"]
-        data = {
+    def serialize(
+        self,
+        flat=False,
+        permitted_nodegroups=None,
+        serialized_items=None,
+        serialized_nodes=None,
+    ):
+        """Pass `serialized_items` (e.g. from a cache) or `serialized_nodes`
+        to skip serializing the list's items or nodes."""
+        if serialized_items is None:
+            serialized_items = self.serialize_items(flat)
+        if serialized_nodes is None:
+            serialized_nodes = self.serialize_nodes(permitted_nodegroups)
+        return {
             "id": str(self.id),
             "name": self.name,
             "dynamic": self.dynamic,
             "searchable": self.searchable,
-            "items": sorted(
-                [
-                    item.serialize(depth_map, flat)
-                    for item in self.list_items.all()
-                    if flat or item.parent_id is None
-                ],
-                key=sort_fn,
-            ),
+            "items": serialized_items,
+            "nodes": serialized_nodes,
         }
-        if hasattr(self, "node_ids"):
-            data["nodes"] = [
-                {
-                    "id": node_id,
-                    "name": node_name,
-                    "nodegroup_id": nodegroup_id,
-                    "graph_id": graph_id,
-                    "graph_name": graph_name,
-                }
-                for node_id, node_name, nodegroup_id, graph_id, graph_name in zip(
-                    self.node_ids,
-                    self.node_names,
-                    self.nodegroup_ids,
-                    self.graph_ids,
-                    self.graph_names,
-                    strict=True,
-                )
-                if permitted_nodegroups is None or nodegroup_id in permitted_nodegroups
+
+    def serialize_summary(self, permitted_nodegroups=None, serialized_nodes=None):
+        """Requires `ListQuerySet.annotate_item_summary()`."""
+        if serialized_nodes is None:
+            serialized_nodes = self.serialize_nodes(permitted_nodegroups)
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "dynamic": self.dynamic,
+            "searchable": self.searchable,
+            "item_count": self.item_count,
+            "max_depth": self.max_depth,
+            "languages": self.languages,
+            "nodes": serialized_nodes,
+        }
+
+    def serialize_items(self, flat=False):
+        list_items = self.list_items.all()
+        if flat:
+            # Already ordered if the items were fetched ordered by `sort_path`.
+            return [
+                item.serialize(flat=True)
+                for item in sorted(list_items, key=lambda item: item.sort_path or [])
             ]
-        else:
-            nodes_using_list = NodeProxy.objects.with_controlled_lists().filter(
-                controlled_list_id=self.pk, source_identifier=None
+        # Group the items by parent once, so that the tree can be
+        # assembled in memory regardless of its depth.
+        children_lookup = defaultdict(list)
+        for item in sorted(list_items, key=lambda item: item.sortorder):
+            children_lookup[item.parent_id].append(item)
+        return [
+            item.serialize(children_lookup=children_lookup)
+            for item in children_lookup[None]
+        ]
+
+    def serialize_items_columnar(self):
+        """Items as parallel arrays in tree order (`parent` holds positions
+        in those arrays), with values and images in tables referencing items
+        by position, and value languages and valuetypes by position in the
+        `languages` and `valuetypes` arrays. Keys are sent once per list
+        rather than once per item or value."""
+        items = sorted(self.list_items.all(), key=lambda item: item.sort_path or [])
+        positions = {item.pk: position for position, item in enumerate(items)}
+        languages = {}
+        valuetypes = {}
+        values = {"id": [], "item": [], "valuetype": [], "language": [], "value": []}
+        images = []
+        for position, item in enumerate(items):
+            for value in item.list_item_values.all():
+                if value.valuetype_id == "image":
+                    continue
+                values["id"].append(str(value.pk))
+                values["item"].append(position)
+                values["valuetype"].append(
+                    valuetypes.setdefault(value.valuetype_id, len(valuetypes))
+                )
+                values["language"].append(
+                    languages.setdefault(value.language_id, len(languages))
+                )
+                values["value"].append(value.value)
+            for image in item.list_item_images.all():
+                serialized_image = image.serialize()
+                del serialized_image["list_item_id"]
+                images.append(serialized_image | {"item": position})
+        return {
+            "id": [str(item.pk) for item in items],
+            "parent": [positions.get(item.parent_id) for item in items],
+            "sortorder": [item.sortorder for item in items],
+            "uri": [item.uri for item in items],
+            "guide": [item.guide for item in items],
+            "depth": [
+                len(item.sort_path) - 1 if item.sort_path else 0 for item in items
+            ],
+            "values": values,
+            "images": images,
+            "languages": list(languages),
+            "valuetypes": list(valuetypes),
+        }
+
+    def serialize_nodes(self, permitted_nodegroups=None):
+        if not hasattr(self, "nodes"):
+            self.nodes = (
+                List.objects.filter(pk=self.pk)
+                .annotate_nodes()
+                .values_list("nodes", flat=True)
+                .get()
             )
-            filtered_nodes = [
-                node
-                for node in nodes_using_list
-                if permitted_nodegroups is None
-                or node.nodegroup_id in permitted_nodegroups
-            ]
-            data["nodes"] = [
-                {
-                    "id": str(node.pk),
-                    "name": node.name,
-                    "nodegroup_id": node.nodegroup_id,
-                    "graph_id": node.graph_id,
-                    "graph_name": str(node.graph.name),
-                }
-                for node in filtered_nodes
-            ]
-        return data
+        if permitted_nodegroups is not None:
+            permitted_nodegroups = {str(pk) for pk in permitted_nodegroups}
+        return [
+            {**node, "graph_name": str(I18n_String(node["graph_name"]))}
+            for node in self.nodes or []
+            if permitted_nodegroups is None
+            or node["nodegroup_id"] in permitted_nodegroups
+        ]
 
     def bulk_update_item_parentage_and_order(self, parent_map, sortorder_map):
         """Item parentage and sortorder are updated together because their
@@ -161,6 +230,7 @@ class List(models.Model):
             item.clean_fields(exclude=exclude_fields)
             reordered_items.append(item)
 
+        # Items moved here from other lists are logged in those lists, too.
         ListItem.objects.bulk_update(
             reordered_items, fields=["sortorder", "parent_id", "list_id"]
         )
@@ -203,11 +273,17 @@ class ListItem(models.Model):
         "self", null=True, blank=True, on_delete=models.CASCADE, related_name="children"
     )
     guide = models.BooleanField(default=False)
+    # Sortorders of every ancestor, then the item's own. Maintained by
+    # ListItemQuerySet.refresh_hierarchy() whenever parentage or order changes.
+    sort_path = ArrayField(models.IntegerField(), null=True, editable=False)
 
     objects = ListItemQuerySet.as_manager()
 
     class Meta:
         ordering = ["sortorder"]
+        indexes = [
+            models.Index(fields=["list", "sort_path"], name="listitem_list_sort_path"),
+        ]
         constraints = [
             ExclusionConstraint(
                 expressions=[
@@ -269,9 +345,47 @@ class ListItem(models.Model):
         if not self.uri:
             self.uri = self.generate_uri()
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        previous_list_id = self.list_id
+        if self._state.adding:
+            action = ListChange.Action.INSERT
+        else:
+            action = ListChange.Action.UPDATE
+        with transaction.atomic():
+            if action == ListChange.Action.UPDATE and (
+                update_fields is None or {"list", "list_id"} & set(update_fields)
+            ):
+                previous_list_id = (
+                    ListItem.objects.filter(pk=self.pk)
+                    .values_list("list_id", flat=True)
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            if update_fields is None or HIERARCHY_FIELDS.intersection(update_fields):
+                sort_paths = ListItem.objects.filter(pk=self.pk).refresh_hierarchy()
+                sort_path = sort_paths.get(self.pk, self.sort_path)
+                if action == ListChange.Action.UPDATE and sort_path != self.sort_path:
+                    action = ListChange.Action.MOVE
+                self.sort_path = sort_path
+            changes = [(self.list_id, "listitem", self.pk, action)]
+            if previous_list_id not in (None, self.list_id):
+                # Moved to another list: a removal from the list it left.
+                changes = [
+                    (list_id, "listitem", self.pk, ListChange.Action.MOVE)
+                    for list_id in (previous_list_id, self.list_id)
+                ]
+            List.objects.filter(pk__in={change[0] for change in changes}).bump_revision(
+                changes
+            )
+
     def delete(self, *args, **kwargs):
         pk = self.pk
-        super().delete(*args, **kwargs)
+        with transaction.atomic():
+            super().delete(*args, **kwargs)
+            List.objects.filter(pk=self.list_id).bump_revision(
+                [(self.list_id, "listitem", pk, ListChange.Action.DELETE)]
+            )
         self.delete_index(pk=pk)
 
     def delete_index(self, pk=None):
@@ -298,11 +412,9 @@ class ListItem(models.Model):
         if not self.list_item_values.filter(valuetype="prefLabel").exists():
             raise ValidationError(_("At least one preferred label is required."))
 
-    def serialize(self, depth_map=None, flat=False):
-        if depth_map is None:
-            depth_map = defaultdict(int)
-        if self.parent_id:
-            depth_map[self.id] = depth_map[self.parent_id] + 1
+    def serialize(self, flat=False, children_lookup=None):
+        """Pass a `children_lookup` of parent id -> child items to serialize
+        the subtree from memory rather than querying `children` per item."""
         data = {
             "id": str(self.id),
             "list_id": str(self.list_id),
@@ -316,35 +428,56 @@ class ListItem(models.Model):
             ],
             "images": [image.serialize() for image in self.list_item_images.all()],
             "parent_id": str(self.parent_id) if self.parent_id else None,
-            "depth": depth_map[self.id],
+            "depth": len(self.sort_path) - 1 if self.sort_path else 0,
         }
         if not flat:
+            if children_lookup is None:
+                children = self.children.all()
+            else:
+                children = children_lookup.get(self.pk, [])
             data["children"] = [
-                child.serialize(depth_map, flat) for child in self.children.all()
+                child.serialize(flat, children_lookup=children_lookup)
+                for child in children
             ]
         return data
 
     def build_tile_value(self):
+        labels = getattr(self, "list_item_labels", self.list_item_values.labels())
         tile_value = {
             "uri": self.uri or self.generate_uri(),
-            "labels": [label.serialize() for label in self.list_item_values.labels()],
+            "labels": [label.serialize() for label in labels],
             "list_id": str(self.list_id),
         }
         return tile_value
 
-    def build_select_option(self):
-        labels = getattr(self, "list_item_labels", self.list_item_values.labels())
-        best_label = self.find_best_label_from_set(labels)
-        data = {
-            "list_item_id": str(self.id),
-            "uri": self.uri,
-            "list_item_values": [label.serialize() for label in labels],
-            "display_value": best_label,
-            "sortorder": self.sortorder,
-        }
-        data["children"] = [
-            child.build_select_option() for child in self.children.all()
-        ]
+    def build_select_option(self, lean=False):
+        """With `lean`, only the display value is included of the item's
+        labels. Fetched by `ListItemQuerySet.fetch_subtrees(lean=True)`, it
+        is read from the precomputed best labels."""
+        if lean:
+            best_label = getattr(self, "best_label", None) or self.find_best_label()
+            data = {
+                "list_item_id": str(self.id),
+                "uri": self.uri,
+                "display_value": best_label,
+                "sortorder": self.sortorder,
+            }
+        else:
+            labels = getattr(self, "list_item_labels", self.list_item_values.labels())
+            data = {
+                "list_item_id": str(self.id),
+                "uri": self.uri,
+                "list_item_values": [label.serialize() for label in labels],
+                "display_value": self.find_best_label_from_set(labels),
+                "sortorder": self.sortorder,
+            }
+        # Set by `ListItemQuerySet.fetch_subtrees()` to avoid querying per level.
+        children_lookup = getattr(self, "children_lookup", None)
+        if children_lookup is None:
+            children = self.children.all()
+        else:
+            children = children_lookup.get(self.pk, [])
+        data["children"] = [child.build_select_option(lean) for child in children]
         return data
 
     @staticmethod
@@ -352,29 +485,33 @@ class ListItem(models.Model):
         labels: Iterable["ListItemValue" | ReferenceLabel],
         language=None,
     ) -> str | None:
-        ranked_labels = sorted(
+        target_lang = language or translation.get_language()
+        best_label = max(
             labels,
             key=lambda label: rank_label(
                 kind=label.valuetype_id,
                 source_lang=label.language_id,
-                target_lang=language or translation.get_language(),
+                target_lang=target_lang,
             ),
-            reverse=True,
+            default=None,
         )
-        if not ranked_labels:
+        if best_label is None:
             return None
-        return ranked_labels[0].value
+        return best_label.value
 
     def find_best_label(self, language=None) -> str | None:
-        prefetched_labels = getattr(self, "list_item_labels", [])
-        return self.find_best_label_from_set(
-            prefetched_labels or self.list_item_values.labels(), language
+        if prefetched_labels := getattr(self, "list_item_labels", []):
+            return self.find_best_label_from_set(prefetched_labels, language)
+        return ListItem.objects.filter(pk=self.pk).best_labels(language).get(self.pk)
+
+    def get_child_uris(self, uris=None):
+        if uris is None:
+            uris = []
+        uris.extend(
+            ListItem.objects.descendants_of(self, include_self=True).values_list(
+                "uri", flat=True
+            )
         )
-
-    def get_child_uris(self, uris=[]):
-        uris.append(self.uri)
-        for child in self.children.all():
-            child.get_child_uris(uris)
         return uris
 
     def duplicate_under_new_parent(
@@ -441,8 +578,9 @@ class ListItem(models.Model):
         """
         sorted_children = []
         children = {}
+        best_labels = self.children.all().best_labels(language)
         for child in self.children.all():
-            label = child.find_best_label(language=language)
+            label = best_labels.get(child.pk)
             children[(child.sortorder, label, child.pk)] = child
 
         children = [val for key, val in sorted(children.items())]
@@ -464,8 +602,11 @@ class ListItem(models.Model):
             if not root_siblings:
                 root_siblings = self.list.list_items.filter(parent__isnull=True)
             siblings = {}
+            best_labels = ListItem.objects.filter(
+                pk__in=[sibling.pk for sibling in root_siblings]
+            ).best_labels(language)
             for sibling in root_siblings:
-                label = sibling.find_best_label(language=language)
+                label = best_labels.get(sibling.pk)
                 siblings[(sibling.sortorder, label, sibling.pk)] = sibling
 
             siblings = [val for key, val in sorted(siblings.items())]
@@ -475,6 +616,103 @@ class ListItem(models.Model):
         return sorted_siblings
 
 
+class ListItemClosure(models.Model):
+    """One row per (ancestor, descendant) pair, including each item paired
+    with itself at depth 0. Maintained by ListItemQuerySet.refresh_hierarchy()."""
+
+    ancestor = models.ForeignKey(
+        ListItem, on_delete=models.CASCADE, related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        ListItem, on_delete=models.CASCADE, related_name="ancestor_links"
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="unique_ancestor_descendant",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["descendant", "depth"], name="listitemclosure_descendant"
+            ),
+        ]
+
+
+class ListItemBestLabel(models.Model):
+    """The label `ListItem.find_best_label_from_set()` ranks highest for an
+    item in each language. Maintained by ListItemQuerySet.refresh_best_labels()
+    whenever labels are written, and read by ListItemQuerySet.best_labels()."""
+
+    list_item = models.ForeignKey(
+        ListItem, on_delete=models.CASCADE, related_name="best_labels"
+    )
+    language = models.ForeignKey(
+        Language,
+        db_column="languageid",
+        to_field="code",
+        on_delete=models.CASCADE,
+    )
+    value = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["list_item", "language"],
+                name="unique_item_best_label_language",
+            ),
+        ]
+
+
+class ListChange(models.Model):
+    """Append-only log of writes to lists and their contents, for clients that
+    sync lists incrementally. Deleting an item implies its descendants, values
+    and images, and deleting an image implies its metadata."""
+
+    class Action(models.TextChoices):
+        INSERT = "insert", _("Insert")
+        UPDATE = "update", _("Update")
+        DELETE = "delete", _("Delete")
+        MOVE = "move", _("Move")
+
+    id = models.BigAutoField(primary_key=True)
+    # Not a foreign key: changes outlive deleted lists.
+    list_id = models.UUIDField()
+    revision = models.PositiveBigIntegerField()
+    model = models.CharField(max_length=63)
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=6, choices=Action.choices)
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["list_id", "revision"], name="listchange_list_revision"
+            ),
+        ]
+
+    @classmethod
+    def for_deleted_list(cls, list_id):
+        return cls(
+            list_id=list_id,
+            revision=next_revision(),
+            model="list",
+            object_id=list_id,
+            action=cls.Action.DELETE,
+        )
+
+    def serialize(self):
+        return {
+            "revision": self.revision,
+            "model": self.model,
+            "id": str(self.object_id),
+            "action": self.action,
+        }
+
+
 class ListItemValue(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     list_item = models.ForeignKey(
@@ -522,6 +760,13 @@ class ListItemValue(models.Model):
                 ),
             ),
         ]
+        indexes = [
+            # Serves case-insensitive substring matching (`value__icontains`).
+            GinIndex(
+                OpClass(Upper("value"), name="gin_trgm_ops"),
+                name="listitemvalue_value_trgm",
+            ),
+        ]
 
     objects = ListItemValueQuerySet.as_manager()
 
@@ -532,7 +777,23 @@ class ListItemValue(models.Model):
             )
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        from arches_controlled_lists.utils.reference_labels import (
+            queue_reference_label_refresh,
+        )
+
+        adding = self._state.adding
+        action = ListChange.Action.INSERT if adding else ListChange.Action.UPDATE
+        was_label = (
+            not adding and ListItemValue.objects.filter(pk=self.pk).labels().exists()
+        )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ListItem.objects.filter(pk=self.list_item_id).refresh_best_labels()
+            List.objects.filter(list_items=self.list_item_id).bump_revision(
+                [(None, "listitemvalue", self.pk, action)]
+            )
+            if was_label or self.valuetype.category == "label":
+                queue_reference_label_refresh([self.list_item_id])
         if self.list_item.list.searchable:
             self.index()
 
@@ -546,10 +807,20 @@ class ListItemValue(models.Model):
         }
 
     def delete(self):
+        from arches_controlled_lists.utils.reference_labels import (
+            queue_reference_label_refresh,
+        )
+
         pk = self.pk
         with transaction.atomic():
             ret = super().delete()
             self.list_item.ensure_pref_label()
+            ListItem.objects.filter(pk=self.list_item_id).refresh_best_labels()
+            List.objects.filter(list_items=self.list_item_id).bump_revision(
+                [(None, "listitemvalue", pk, ListChange.Action.DELETE)]
+            )
+            if self.valuetype.category == "label":
+                queue_reference_label_refresh([self.list_item_id])
             self.delete_index(pk=pk)
         return ret
 
@@ -607,6 +878,24 @@ class ListItemImage(models.Model):
         managed = False
         db_table = "arches_controlled_lists_listitemvalue"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        action = ListChange.Action.INSERT if adding else ListChange.Action.UPDATE
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            List.objects.filter(list_items=self.list_item_id).bump_revision(
+                [(None, "listitemimage", self.pk, action)]
+            )
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        with transaction.atomic():
+            ret = super().delete(*args, **kwargs)
+            List.objects.filter(list_items=self.list_item_id).bump_revision(
+                [(None, "listitemimage", pk, ListChange.Action.DELETE)]
+            )
+        return ret
+
     def clean(self):
         extension = self.value.name.split(".")[-1]
         validator = FileValidator()
@@ -646,6 +935,8 @@ class ListItemImageMetadata(models.Model):
     metadata_type = models.CharField(max_length=5, choices=MetadataChoices)
     value = models.CharField(max_length=2048)
 
+    objects = ListItemImageMetadataQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -657,6 +948,26 @@ class ListItemImageMetadata(models.Model):
             ),
         ]
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        action = ListChange.Action.INSERT if adding else ListChange.Action.UPDATE
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            List.objects.filter(
+                list_items__list_item_images=self.list_item_image_id
+            ).bump_revision([(None, "listitemimagemetadata", self.pk, action)])
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        with transaction.atomic():
+            ret = super().delete(*args, **kwargs)
+            List.objects.filter(
+                list_items__list_item_images=self.list_item_image_id
+            ).bump_revision(
+                [(None, "listitemimagemetadata", pk, ListChange.Action.DELETE)]
+            )
+        return ret
+
     def serialize(self):
         choices = ListItemImageMetadata.MetadataChoices
         return {
@@ -1,16 +1,113 @@
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import JSONBAgg
 from django.contrib.postgres.expressions import ArraySubquery
-from django.db import models
+from django.db import connection, models, transaction
 from django.db.models.fields.json import KT
-from django.db.models.functions import Cast
+from django.db.models.functions import Cast, Coalesce, JSONObject
+from django.utils import translation
+
+
+REVISION_SEQUENCE = "arches_controlled_lists_revision_seq"
+
+
+def next_revision():
+    """Draws from the sequence shared by all lists, so a revision is never
+    reached twice: not after a rollback, nor by a list deleted and recreated
+    with the same id."""
+    return models.Func(
+        template=f"nextval('{REVISION_SEQUENCE}')",
+        output_field=models.PositiveBigIntegerField(),
+    )
 
 
 class ListQuerySet(models.QuerySet):
     def delete(self, *args, **kwargs):
+        from arches_controlled_lists.models import ListChange
+
+        deleted_lists = []
         for obj in self:
             obj.delete_index()
-        return super(ListQuerySet, self).delete(*args, **kwargs)
+            deleted_lists.append(obj)
+        with transaction.atomic():
+            deleted = super(ListQuerySet, self).delete(*args, **kwargs)
+            ListChange.objects.bulk_create(
+                ListChange.for_deleted_list(obj.pk) for obj in deleted_lists
+            )
+        return deleted
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from arches_controlled_lists.models import ListChange
+
+        with transaction.atomic():
+            created = super().bulk_create(objs, *args, **kwargs)
+            self.model.objects.filter(pk__in=[obj.pk for obj in created]).bump_revision(
+                [(obj.pk, "list", obj.pk, ListChange.Action.INSERT) for obj in created]
+            )
+        return created
+
+    def bump_revision(self, changes=()):
+        """Record that these lists (or anything in them) changed, which
+        invalidates cached representations keyed on `revision`.
+
+        `changes` are logged for the change feed at the new revision of their
+        list, as (list id, model name, object id, action) tuples. The list id
+        may be None when this queryset holds a single list."""
+        from arches_controlled_lists.models import ListChange
+
+        with transaction.atomic():
+            updated = self.update(revision=next_revision())
+            if changes:
+                revisions = dict(self.values_list("pk", "revision"))
+                only_list_id = next(iter(revisions)) if len(revisions) == 1 else None
+                ListChange.objects.bulk_create(
+                    ListChange(
+                        list_id=list_id or only_list_id,
+                        revision=revisions[list_id or only_list_id],
+                        model=model,
+                        object_id=object_id,
+                        action=action,
+                    )
+                    for list_id, model, object_id, action in changes
+                )
+        return updated
+
+    def annotate_item_summary(self):
+        """Annotates counts and other aggregates over each list's items,
+        computed in the database rather than by fetching the items."""
+        from arches_controlled_lists.models import ListItem, ListItemValue
+
+        items = ListItem.objects.filter(list=models.OuterRef("pk")).order_by()
+        item_count = items.values("list").annotate(count=models.Count("pk"))
+        max_depth = items.values("list").annotate(
+            depth=models.Max(
+                models.Func(
+                    "sort_path",
+                    function="cardinality",
+                    output_field=models.IntegerField(),
+                )
+            )
+            - 1
+        )
+        languages = (
+            ListItemValue.objects.filter(
+                list_item__list=models.OuterRef("pk"), language__isnull=False
+            )
+            .order_by("language_id")
+            .values("language_id")
+            .distinct()
+        )
+        return self.annotate(
+            item_count=Coalesce(models.Subquery(item_count.values("count")), 0),
+            max_depth=models.Subquery(max_depth.values("depth")),
+            languages=ArraySubquery(languages),
+        )
 
     def annotate_node_fields(self, **kwargs):
+        """Annotates an array per keyword of the given field of each node using
+        the list, e.g. `annotate_node_fields(node_ids="pk")`. This costs a
+        subquery per field: `annotate_nodes()` gathers whole node records in
+        one."""
         from arches_controlled_lists.models import NodeProxy
 
         qs = self
@@ -28,12 +125,292 @@ class ListQuerySet(models.QuerySet):
 
         return qs
 
+    def annotate_nodes(self):
+        """Annotates `nodes`: a JSON array with a record per node using the
+        list, gathered by one correlated subquery."""
+        from arches_controlled_lists.models import NodeProxy
+
+        nodes = (
+            NodeProxy.objects.with_controlled_lists()
+            .filter(controlled_list_id=models.OuterRef("id"), source_identifier=None)
+            .values("controlled_list_id")
+            .annotate(
+                records=JSONBAgg(
+                    JSONObject(
+                        id="pk",
+                        name="name",
+                        nodegroup_id="nodegroup_id",
+                        graph_id="graph_id",
+                        graph_name="graph__name",
+                    ),
+                    order_by="pk",
+                )
+            )
+            .values("records")
+        )
+        return self.annotate(nodes=models.Subquery(nodes))
+
+
+# Writes to any of these fields invalidate materialized hierarchy columns.
+HIERARCHY_FIELDS = {"list", "list_id", "parent", "parent_id", "sortorder"}
+
+# Mirrors the loop breaker formerly used when computing paths in Python.
+MAX_HIERARCHY_DEPTH = 1000
+
 
 class ListItemQuerySet(models.QuerySet):
     def delete(self, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange
+
+        changes = []
         for obj in self:
             obj.delete_index()
-        return super(ListItemQuerySet, self).delete(*args, **kwargs)
+            changes.append((obj.list_id, "listitem", obj.pk, ListChange.Action.DELETE))
+        with transaction.atomic():
+            deleted = super(ListItemQuerySet, self).delete(*args, **kwargs)
+            List.objects.filter(pk__in={change[0] for change in changes}).bump_revision(
+                changes
+            )
+        return deleted
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange
+
+        with transaction.atomic():
+            created = super().bulk_create(objs, *args, **kwargs)
+            self._refresh_hierarchy_of(created)
+            List.objects.filter(pk__in={obj.list_id for obj in created}).bump_revision(
+                [
+                    (obj.list_id, "listitem", obj.pk, ListChange.Action.INSERT)
+                    for obj in created
+                ]
+            )
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange
+
+        objs = list(objs)
+        if HIERARCHY_FIELDS.intersection(fields):
+            action = ListChange.Action.MOVE
+        else:
+            action = ListChange.Action.UPDATE
+        with transaction.atomic():
+            previous_list_ids = {}
+            if {"list", "list_id"}.intersection(fields):
+                previous_list_ids = dict(
+                    self.model.objects.filter(
+                        pk__in=[obj.pk for obj in objs]
+                    ).values_list("pk", "list_id")
+                )
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            if action == ListChange.Action.MOVE:
+                self._refresh_hierarchy_of(objs)
+            changes = [(obj.list_id, "listitem", obj.pk, action) for obj in objs]
+            # Items moved to another list are also removals from the list they left.
+            changes += [
+                (previous_list_ids[obj.pk], "listitem", obj.pk, action)
+                for obj in objs
+                if previous_list_ids.get(obj.pk, obj.list_id) != obj.list_id
+            ]
+            List.objects.filter(pk__in={change[0] for change in changes}).bump_revision(
+                changes
+            )
+        return updated
+
+    def _refresh_hierarchy_of(self, objs):
+        if not objs:
+            return
+        sort_paths = self.model.objects.filter(
+            pk__in=[obj.pk for obj in objs]
+        ).refresh_hierarchy()
+        for obj in objs:
+            if obj.pk in sort_paths:
+                obj.sort_path = sort_paths[obj.pk]
+
+    def refresh_hierarchy(self):
+        """Recalculate the materialized hierarchy of these items and their
+        descendants: the `sort_path` column (the sortorders of every ancestor,
+        then the item's own) and the ancestor/descendant closure table.
+        Returns a mapping of item id to its new sort path."""
+        from arches_controlled_lists.models import ListItemClosure
+
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        closure_table = connection.ops.quote_name(ListItemClosure._meta.db_table)
+        items_sql, params = self.order_by().values("pk").query.sql_with_params()
+        subtree = f"""
+            subtree AS (
+                SELECT id FROM {table} WHERE id IN ({items_sql})
+                UNION
+                SELECT child.id FROM {table} child
+                JOIN subtree ON child.parent_id = subtree.id
+            )
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH RECURSIVE {subtree}
+                DELETE FROM {closure_table}
+                WHERE descendant_id IN (SELECT id FROM subtree)
+                """,
+                params,
+            )
+            cursor.execute(
+                f"""
+                WITH RECURSIVE {subtree},
+                ancestry AS (
+                    SELECT item.id AS ancestor_id, item.id AS descendant_id,
+                        item.parent_id, item.sortorder, 0 AS depth
+                    FROM {table} item JOIN subtree ON item.id = subtree.id
+                    UNION ALL
+                    SELECT parent.id, ancestry.descendant_id,
+                        parent.parent_id, parent.sortorder, ancestry.depth + 1
+                    FROM ancestry
+                    JOIN {table} parent ON parent.id = ancestry.parent_id
+                    WHERE ancestry.depth < %s
+                ),
+                linked AS (
+                    INSERT INTO {closure_table} (ancestor_id, descendant_id, depth)
+                    SELECT ancestor_id, descendant_id, depth FROM ancestry
+                )
+                UPDATE {table} SET sort_path = paths.sort_path
+                FROM (
+                    SELECT descendant_id,
+                        array_agg(sortorder ORDER BY depth DESC) AS sort_path
+                    FROM ancestry GROUP BY descendant_id
+                ) paths
+                WHERE {table}.id = paths.descendant_id
+                RETURNING {table}.id, {table}.sort_path
+                """,
+                (*params, MAX_HIERARCHY_DEPTH),
+            )
+            return dict(cursor.fetchall())
+
+    def descendants_of(self, item, include_self=False):
+        """Items below `item` (an instance or primary key) at any depth."""
+        return self.filter(
+            ancestor_links__ancestor=item,
+            ancestor_links__depth__gte=0 if include_self else 1,
+        ).order_by("sort_path")
+
+    def ancestors_of(self, item, include_self=False):
+        """Items above `item` (an instance or primary key), root first."""
+        return self.filter(
+            descendant_links__descendant=item,
+            descendant_links__depth__gte=0 if include_self else 1,
+        ).order_by("sort_path")
+
+    def with_child_count(self):
+        return self.annotate(child_count=models.Count("children"))
+
+    def fetch_subtrees(self, lean=False):
+        """Returns these items, fetched together with their descendants and
+        labels in a constant number of queries. Every fetched item carries a
+        `children_lookup` (parent id -> children) from which
+        `ListItem.build_select_option()` assembles subtrees in memory.
+
+        With `lean`, only each item's best label in the active language is
+        fetched, for `ListItem.build_select_option(lean=True)`."""
+        from arches_controlled_lists.models import ListItemClosure
+
+        requested_ids = set(self.values_list("pk", flat=True))
+        subtree_items = self.model.objects.filter(
+            pk__in=ListItemClosure.objects.filter(ancestor__in=requested_ids).values(
+                "descendant"
+            )
+        )
+        if lean:
+            subtree_items = list(subtree_items.with_best_label())
+            # E.g. the active language was added after the labels were written.
+            unranked = {item.pk: item for item in subtree_items if not item.best_label}
+            if unranked:
+                ranked = self.model.objects.filter(pk__in=unranked).rank_best_labels()
+                for item_id, item in unranked.items():
+                    item.best_label = ranked.get(item_id)
+        else:
+            subtree_items = subtree_items.with_list_item_labels()
+
+        children_lookup = defaultdict(list)
+        for item in subtree_items:
+            item.children_lookup = children_lookup
+            children_lookup[item.parent_id].append(item)
+        return [item for item in subtree_items if item.pk in requested_ids]
+
+    def refresh_best_labels(self, languages=None):
+        """Recalculate the precomputed best label of these items in each of
+        `languages` (default: every language), ranked as by
+        `ListItem.find_best_label_from_set()`."""
+        from arches_controlled_lists.models import (
+            Language,
+            ListItemBestLabel,
+            ListItemValue,
+        )
+
+        item_ids = self.order_by().values("pk")
+        labels_by_item = defaultdict(list)
+        for label in ListItemValue.objects.labels().filter(list_item__in=item_ids):
+            labels_by_item[label.list_item_id].append(label)
+        if languages is None:
+            languages = list(Language.objects.values_list("code", flat=True))
+
+        best_labels = [
+            ListItemBestLabel(
+                list_item_id=item_id,
+                language_id=language,
+                value=self.model.find_best_label_from_set(labels, language),
+            )
+            for item_id, labels in labels_by_item.items()
+            for language in languages
+        ]
+        with transaction.atomic():
+            ListItemBestLabel.objects.filter(
+                list_item__in=item_ids, language_id__in=languages
+            ).delete()
+            ListItemBestLabel.objects.bulk_create(best_labels, batch_size=5000)
+
+    def with_best_label(self, language=None):
+        """Annotates `best_label`: the precomputed best label in `language`
+        (default: the active language), or None if there is none."""
+        from arches_controlled_lists.models import ListItemBestLabel
+
+        best_label = ListItemBestLabel.objects.filter(
+            list_item=models.OuterRef("pk"),
+            language_id=language or translation.get_language(),
+        ).values("value")
+        return self.annotate(best_label=models.Subquery(best_label))
+
+    def best_labels(self, language=None):
+        """Returns a mapping of item id to best label in `language` (default:
+        the active language), read from the precomputed best labels in one
+        query. Items lacking one for the language (e.g. a language added
+        since their labels were written) are ranked from their labels."""
+        language = language or translation.get_language()
+        best_labels = dict(
+            self.order_by().with_best_label(language).values_list("pk", "best_label")
+        )
+        unranked = [pk for pk, value in best_labels.items() if value is None]
+        if unranked:
+            best_labels.update(
+                self.model.objects.filter(pk__in=unranked).rank_best_labels(language)
+            )
+        return best_labels
+
+    def rank_best_labels(self, language=None):
+        """Returns a mapping of item id to best label in `language` (default:
+        the active language), ranked from the items' labels in one query
+        rather than read from the precomputed best labels."""
+        from arches_controlled_lists.models import ListItemValue
+
+        language = language or translation.get_language()
+        labels_by_item = defaultdict(list)
+        for label in ListItemValue.objects.labels().filter(
+            list_item__in=self.order_by().values("pk")
+        ):
+            labels_by_item[label.list_item_id].append(label)
+        return {
+            item_id: self.model.find_best_label_from_set(labels, language)
+            for item_id, labels in labels_by_item.items()
+        }
 
     def with_list_item_labels(self):
         from arches_controlled_lists.models import ListItemValue
@@ -49,9 +426,94 @@ class ListItemQuerySet(models.QuerySet):
 
 class ListItemValueQuerySet(models.QuerySet):
     def delete(self, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange, ListItem
+        from arches_controlled_lists.utils.reference_labels import (
+            queue_reference_label_refresh,
+        )
+
         for obj in self:
             obj.delete_index()
-        return super(ListItemValueQuerySet, self).delete(*args, **kwargs)
+        changes = []
+        item_ids = set()
+        for pk, list_id, item_id in self.values_list(
+            "pk", "list_item__list_id", "list_item_id"
+        ):
+            changes.append((list_id, "listitemvalue", pk, ListChange.Action.DELETE))
+            item_ids.add(item_id)
+        label_item_ids = set(self.labels().values_list("list_item_id", flat=True))
+        with transaction.atomic():
+            deleted = super(ListItemValueQuerySet, self).delete(*args, **kwargs)
+            ListItem.objects.filter(pk__in=item_ids).refresh_best_labels()
+            List.objects.filter(pk__in={change[0] for change in changes}).bump_revision(
+                changes
+            )
+            if label_item_ids:
+                queue_reference_label_refresh(label_item_ids)
+        return deleted
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange, ListItem
+        from arches_controlled_lists.utils.reference_labels import (
+            queue_reference_label_refresh,
+        )
+
+        with transaction.atomic():
+            created = super().bulk_create(objs, *args, **kwargs)
+            items = ListItem.objects.filter(
+                pk__in={obj.list_item_id for obj in created}
+            )
+            items.refresh_best_labels()
+            label_item_ids = set(
+                self.model.objects.filter(pk__in=[obj.pk for obj in created])
+                .labels()
+                .values_list("list_item_id", flat=True)
+            )
+            if label_item_ids:
+                queue_reference_label_refresh(label_item_ids)
+            list_ids = dict(items.values_list("pk", "list_id"))
+            List.objects.filter(pk__in=list_ids.values()).bump_revision(
+                [
+                    (
+                        list_ids[obj.list_item_id],
+                        "listitemvalue",
+                        obj.pk,
+                        ListChange.Action.INSERT,
+                    )
+                    for obj in created
+                ]
+            )
+        return created
+
+    def update(self, **kwargs):
+        from arches_controlled_lists.models import List, ListChange, ListItem
+        from arches_controlled_lists.utils.reference_labels import (
+            queue_reference_label_refresh,
+        )
+
+        rows = list(self.values_list("pk", "list_item__list_id", "list_item_id"))
+        label_item_ids = set(self.labels().values_list("list_item_id", flat=True))
+        with transaction.atomic():
+            updated = super().update(**kwargs)
+            ListItem.objects.filter(
+                pk__in={item_id for _, _, item_id in rows}
+            ).refresh_best_labels()
+            List.objects.filter(
+                pk__in={list_id for _, list_id, _ in rows}
+            ).bump_revision(
+                [
+                    (list_id, "listitemvalue", pk, ListChange.Action.UPDATE)
+                    for pk, list_id, _ in rows
+                ]
+            )
+            # Values may also have become labels.
+            label_item_ids.update(
+                self.model.objects.filter(pk__in=[pk for pk, _, _ in rows])
+                .labels()
+                .values_list("list_item_id", flat=True)
+            )
+            if label_item_ids:
+                queue_reference_label_refresh(label_item_ids)
+        return updated
 
     def values_without_images(self):
         return self.exclude(valuetype="image")
@@ -63,11 +525,45 @@ class ListItemValueQuerySet(models.QuerySet):
         return self.filter(valuetype="image")
 
 
-class ListItemImageManager(models.Manager):
+class ListItemImageQuerySet(models.QuerySet):
+    def delete(self, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange
+
+        changes = [
+            (list_id, "listitemimage", pk, ListChange.Action.DELETE)
+            for pk, list_id in self.values_list("pk", "list_item__list_id")
+        ]
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            List.objects.filter(pk__in={change[0] for change in changes}).bump_revision(
+                changes
+            )
+        return deleted
+
+
+class ListItemImageManager(models.Manager.from_queryset(ListItemImageQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(valuetype="image")
 
 
+class ListItemImageMetadataQuerySet(models.QuerySet):
+    def delete(self, *args, **kwargs):
+        from arches_controlled_lists.models import List, ListChange
+
+        changes = [
+            (list_id, "listitemimagemetadata", pk, ListChange.Action.DELETE)
+            for pk, list_id in self.values_list(
+                "pk", "list_item_image__list_item__list_id"
+            )
+        ]
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            List.objects.filter(pk__in={change[0] for change in changes}).bump_revision(
+                changes
+            )
+        return deleted
+
+
 class NodeQuerySet(models.QuerySet):
     def with_controlled_lists(self):
         """Annotates a queryset with an indexed lookup on controlled lists, e.g.:
@@ -24,12 +24,11 @@ class ReferencesEsMappingModifier(EsMappingModifier):
         search_query, term, permitted_nodegroups, include_provisional
     ):
         if term["type"] == "reference":
-            item = (
-                ListItem.objects.filter(pk=term["value"])
-                .prefetch_related("__".join(["children"] * 10))
-                .get()
+            uris = list(
+                ListItem.objects.descendants_of(
+                    term["value"], include_self=True
+                ).values_list("uri", flat=True)
             )
-            uris = item.get_child_uris(uris=[])
             references_filter = Bool()
             references_filter.filter(
                 Terms(field=f"{REFERENCES_INDEX_PATH}.uri", terms=uris)
@@ -71,7 +70,7 @@ class ReferencesEsMappingModifier(EsMappingModifier):
         return {
             "type": "nested",
             "properties": {
-                "id": {"type": "keyword"},
+                "label_ids": {"type": "keyword"},
                 "uri": {"type": "keyword"},
                 "list_id": {"type": "keyword"},
                 "nodegroup_id": {"type": "keyword"},
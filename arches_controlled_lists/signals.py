@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from arches.app.models.models import GraphXPublishedGraph, Language, Node
+from arches_controlled_lists.datatypes.datatypes import clear_node_configs
+from arches_controlled_lists.models import ListItem, NodeProxy
+
+
+@receiver(post_save, sender=Language)
+def add_best_labels_for_language(sender, instance, created, raw=False, **kwargs):
+    """Precompute best labels in a new language, which would otherwise be
+    ranked from the labels of every item on every read."""
+    if created and not raw:
+        ListItem.objects.all().refresh_best_labels(languages=[instance.code])
+
+
+@receiver(post_save, sender=GraphXPublishedGraph)
+@receiver(post_save, sender=Node)
+@receiver(post_save, sender=NodeProxy)
+@receiver(post_delete, sender=Node)
+@receiver(post_delete, sender=NodeProxy)
+def clear_reference_node_configs(sender, **kwargs):
+    clear_node_configs()
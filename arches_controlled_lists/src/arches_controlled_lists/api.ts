@@ -25,8 +25,16 @@ function getToken() {
     return token;
 }
 
-export const fetchLists = async () => {
-    const response = await fetch(arches.urls.controlled_lists);
+export const fetchLists = async (summary = false) => {
+    const params = new URLSearchParams();
+    if (summary) {
+        // List metadata and item counts only, without the items.
+        params.append("summary", "true");
+    }
+    // Revalidate with the server's ETag, which answers 304 if unchanged.
+    const response = await fetch(`${arches.urls.controlled_lists}?${params}`, {
+        cache: "no-cache",
+    });
     try {
         const parsed = await response.json();
         if (response.ok) {
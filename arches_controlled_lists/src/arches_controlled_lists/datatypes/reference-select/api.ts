@@ -1,14 +1,25 @@
 import arches from "arches";
 
+import type {
+    ReferenceSelectLabel,
+    ReferenceSelectSearchResult,
+} from "@/arches_controlled_lists/datatypes/reference-select/types.ts";
+
 export const fetchWidgetOptions = async (
     graphSlug: string,
     nodeAlias: string,
+    lean = false,
 ) => {
     const params = new URLSearchParams();
     params.append("graph_slug", graphSlug);
     params.append("node_alias", nodeAlias);
+    if (lean) {
+        params.append("lean", "true");
+    }
+    // Revalidate with the server's ETag, which answers 304 if unchanged.
     const response = await fetch(
         `${arches.urls.controlled_list_options}?${params}`,
+        { cache: "no-cache" },
     );
     try {
         const parsed = await response.json();
@@ -20,3 +31,46 @@ export const fetchWidgetOptions = async (
         throw new Error((error as Error).message || response.statusText);
     }
 };
+
+export const fetchListItemLabels = async (itemId: string) => {
+    const response = await fetch(
+        arches.urls.controlled_list_item_labels(itemId),
+        { cache: "no-cache" },
+    );
+    try {
+        const parsed = await response.json();
+        if (response.ok) {
+            return parsed as ReferenceSelectLabel[];
+        }
+        throw new Error(parsed.message);
+    } catch (error) {
+        throw new Error((error as Error).message || response.statusText);
+    }
+};
+
+export const searchWidgetOptions = async (
+    graphSlug: string,
+    nodeAlias: string,
+    term: string,
+    language?: string,
+) => {
+    const params = new URLSearchParams();
+    params.append("graph_slug", graphSlug);
+    params.append("node_alias", nodeAlias);
+    params.append("term", term);
+    if (language) {
+        params.append("language", language);
+    }
+    const response = await fetch(
+        `${arches.urls.controlled_list_options_search}?${params}`,
+    );
+    try {
+        const parsed = await response.json();
+        if (response.ok) {
+            return parsed as ReferenceSelectSearchResult[];
+        }
+        throw new Error(parsed.message);
+    } catch (error) {
+        throw new Error((error as Error).message || response.statusText);
+    }
+};
@@ -34,6 +34,20 @@ export interface ReferenceSelectDetails {
     uri: string;
 }
 
+export interface ReferenceSelectLeanOption {
+    list_item_id: string;
+    uri: string;
+    display_value: string;
+    sortorder: number;
+    children: ReferenceSelectLeanOption[];
+}
+
+export interface ReferenceSelectSearchResult
+    extends Omit<ReferenceSelectDetails, "children"> {
+    matched_value: string;
+    ancestors: { list_item_id: string; display_value: string }[];
+}
+
 export interface ReferenceSelectLabel {
     id: string;
     language_id: string;
@@ -46,5 +60,5 @@ export interface ReferenceSelectTreeNode extends TreeNode {
     key: string;
     label: string;
     children: ReferenceSelectTreeNode[];
-    data: ReferenceSelectDetails;
+    data: ReferenceSelectLeanOption;
 }
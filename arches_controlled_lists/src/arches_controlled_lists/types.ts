@@ -91,6 +91,29 @@ export interface ControlledListItem {
     depth: number;
 }
 
+// Items of a list fetched with ?format=columnar: parallel arrays in tree
+// order, where `parent`, `values.item` and `images[].item` are positions in
+// those arrays, and `values.language`/`values.valuetype` are positions in
+// `languages`/`valuetypes`.
+export interface ControlledListColumnarItems {
+    id: string[];
+    parent: (number | null)[];
+    sortorder: number[];
+    uri: string[];
+    guide: boolean[];
+    depth: number[];
+    values: {
+        id: string[];
+        item: number[];
+        valuetype: number[];
+        language: number[];
+        value: string[];
+    };
+    images: (Omit<ControlledListItemImage, "list_item_id"> & { item: number })[];
+    languages: string[];
+    valuetypes: string[];
+}
+
 export interface NewControlledListItem {
     id: null;
     list_id: string;
@@ -0,0 +1,17 @@
+import logging
+
+from celery import shared_task
+
+from arches_controlled_lists.utils.reference_labels import refresh_reference_labels
+
+
+@shared_task
+def refresh_reference_labels_task(list_item_ids):
+    logger = logging.getLogger(__name__)
+    summary = refresh_reference_labels(list_item_ids)
+    logger.info(
+        "Refreshed reference labels in %(tiles)s tiles of %(resources)s "
+        "resources in %(seconds).2fs",
+        summary,
+    )
+    return summary
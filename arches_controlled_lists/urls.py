@@ -6,13 +6,18 @@ from django.urls import include, path
 from arches_controlled_lists.views import (
     ListsView,
     ListView,
+    ListChangesView,
     ListExportView,
     ListItemView,
+    ListItemChildrenView,
+    ListItemLabelsView,
     ListItemImageView,
     ListItemImageMetadataView,
     ListItemValueView,
     ListItemCopyView,
     ListOptionsView,
+    ListOptionsBatchView,
+    ListOptionsSearchView,
 )
 
 urlpatterns = [
@@ -22,6 +27,16 @@ urlpatterns = [
         ListView.as_view(),
         name="controlled_list",
     ),
+    path(
+        "api/controlled_list/<uuid:list_id>/children",
+        ListItemChildrenView.as_view(),
+        name="controlled_list_children",
+    ),
+    path(
+        "api/controlled_list/<uuid:list_id>/changes",
+        ListChangesView.as_view(),
+        name="controlled_list_changes",
+    ),
     path("api/controlled_list", ListView.as_view(), name="controlled_list_add"),
     path(
         "api/controlled_list_item/<uuid:item_id>/copy",
@@ -33,6 +48,11 @@ urlpatterns = [
         ListExportView.as_view(),
         name="controlled_list_export",
     ),
+    path(
+        "api/controlled_list_item/<uuid:item_id>/labels",
+        ListItemLabelsView.as_view(),
+        name="controlled_list_item_labels",
+    ),
     path(
         "api/controlled_list_item/<uuid:item_id>",
         ListItemView.as_view(),
@@ -78,6 +98,16 @@ urlpatterns = [
         ListOptionsView.as_view(),
         name="controlled_list_options",
     ),
+    path(
+        "api/controlled_list_options/batch",
+        ListOptionsBatchView.as_view(),
+        name="controlled_list_options_batch",
+    ),
+    path(
+        "api/controlled_list_options/search",
+        ListOptionsSearchView.as_view(),
+        name="controlled_list_options_search",
+    ),
 ]
 
 
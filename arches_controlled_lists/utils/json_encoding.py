@@ -0,0 +1,29 @@
+"""JSON encoding for controlled list payloads: large, nested structures of
+dicts, lists and strings (`List.serialize()`, `ListItem.serialize()`,
+`ListItem.build_select_option()`). These need none of the model handling of
+Arches' `JSONSerializer`, so they are encoded with orjson when it is installed
+(`pip install arches-controlled-lists[fast-json]`), else with the standard
+library."""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        # orjson handles UUIDs natively; lazy translations need the fallback.
+        return orjson.dumps(data, default=DjangoJSONEncoder().default)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class ControlledListJSONResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,108 @@
+"""Lookup of list items by label, for imports that identify list items by
+label rather than by id. Labels are first matched exactly by a query; an
+in-memory index of the list is only built for labels that need normalizing,
+and kept for the few lists most recently used, until the list changes."""
+
+import unicodedata
+from functools import lru_cache
+from uuid import UUID
+
+from django.db.models import F
+
+from arches_controlled_lists.models import List, ListItemValue
+
+
+def normalize_label(label: str) -> str:
+    """Folds case, diacritics, and runs of whitespace."""
+    decomposed = unicodedata.normalize("NFKD", label)
+    return " ".join(
+        "".join(char for char in decomposed if not unicodedata.combining(char))
+        .casefold()
+        .split()
+    )
+
+
+class ListItemLabelIndex:
+    def __init__(self, list_id, version):
+        self.list_id = list_id
+        self.version = version
+        # (label, language or None) -> item id, exact and normalized.
+        self.exact = {}
+        self.normalized = {}
+
+    @classmethod
+    def build(cls, list_id, version):
+        index = cls(list_id, version)
+        labels = (
+            ListItemValue.objects.labels()
+            .filter(list_item__list_id=list_id)
+            .order_by(
+                F("list_item__parent").asc(nulls_first=True), "list_item__sortorder"
+            )
+            .values_list("value", "language_id", "list_item_id")
+        )
+        # Items nearer the root, then lower sortorders, take precedence.
+        for value, language, item_id in labels.iterator():
+            folded = normalize_label(value)
+            for key in (value, language), (value, None):
+                index.exact.setdefault(key, item_id)
+            for key in (folded, language), (folded, None):
+                index.normalized.setdefault(key, item_id)
+        return index
+
+    def lookup(self, label: str, language=None) -> UUID | None:
+        """Returns the id of the preferred item with `label` (in `language`,
+        if given), matched exactly if possible, else after normalization."""
+        if item_id := self.exact.get((label, language)):
+            return item_id
+        return self.normalized.get((normalize_label(label), language))
+
+
+# Indexes can hold every label of a list, so only a few are kept.
+LABEL_INDEX_CACHE_SIZE = 16
+
+
+@lru_cache(maxsize=LABEL_INDEX_CACHE_SIZE)
+def _build_label_index(list_id, version) -> ListItemLabelIndex:
+    # Keyed on the revision, so indexes of earlier revisions age out.
+    return ListItemLabelIndex.build(list_id, version)
+
+
+def get_label_index(list_id) -> ListItemLabelIndex | None:
+    """Returns the index of the list, or None if there is no such list."""
+    try:
+        list_id = UUID(str(list_id))
+    except ValueError:
+        return None
+    version = List.objects.filter(pk=list_id).values_list("revision", flat=True).first()
+    if version is None:
+        return None
+    return _build_label_index(list_id, version)
+
+
+def lookup_list_item_ids(list_id, labels, language=None) -> dict[str, UUID]:
+    """Returns a mapping of each of `labels` found in the list to the id of
+    its preferred item, as `ListItemLabelIndex.lookup()` would. Exact matches
+    are read directly, so the index is only consulted for the rest."""
+    try:
+        list_id = UUID(str(list_id))
+    except ValueError:
+        return {}
+    exact = (
+        ListItemValue.objects.labels()
+        .filter(list_item__list_id=list_id, value__in=labels)
+        .order_by(F("list_item__parent").asc(nulls_first=True), "list_item__sortorder")
+        .values_list("value", "list_item_id")
+    )
+    if language:
+        exact = exact.filter(language_id=language)
+    item_ids = {}
+    for value, item_id in exact:
+        item_ids.setdefault(value, item_id)
+
+    unmatched = [label for label in labels if label not in item_ids]
+    if unmatched and (index := get_label_index(list_id)) is not None:
+        for label in unmatched:
+            if (item_id := index.lookup(label, language)) is not None:
+                item_ids[label] = item_id
+    return item_ids
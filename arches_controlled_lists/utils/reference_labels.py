@@ -0,0 +1,197 @@
+"""Rewrites the label snapshots stored in reference tile values after list item
+labels change, then reindexes the resources whose tiles were rewritten."""
+
+import json
+import logging
+import time
+from collections import defaultdict
+
+from django.db import connection, transaction
+
+from arches.app.models.models import TileModel
+from arches.app.utils.task_management import check_if_celery_available
+from arches_controlled_lists.models import ListItem, ListItemValue, NodeProxy
+
+logger = logging.getLogger(__name__)
+
+
+# Label maps sent with each UPDATE hold at most this many items.
+ITEMS_PER_PASS = 5000
+
+
+def refresh_reference_labels(
+    list_item_ids=None, list_ids=None, batch_size=1000, reindex=True
+):
+    """Replaces the labels of references to `list_item_ids` (or to the items
+    of `list_ids`, default all) in tile data with the items' current labels.
+
+    Lists are handled one at a time, and their items in passes of at most
+    ITEMS_PER_PASS, so a label map never spans more than one pass. Tiles of
+    each reference node are read in batches of `batch_size` and rewritten by a
+    single UPDATE per batch; tiles already holding current labels are left
+    untouched.
+
+    Returns a summary of the items, tiles and resources updated and the time
+    taken.
+    """
+    start = time.perf_counter()
+    items = ListItem.objects.all()
+    if list_item_ids is not None:
+        items = items.filter(pk__in=list_item_ids)
+    if list_ids is not None:
+        items = items.filter(list_id__in=list_ids)
+
+    item_count = 0
+    tile_count = 0
+    resource_ids = set()
+    for list_id in items.order_by().values_list("list_id", flat=True).distinct():
+        item_ids = list(
+            items.filter(list_id=list_id).order_by("pk").values_list("pk", flat=True)
+        )
+        item_count += len(item_ids)
+        nodes = list(
+            NodeProxy.objects.with_controlled_lists()
+            .filter(datatype="reference", controlled_list_id=list_id)
+            .values_list("pk", "nodegroup_id")
+        )
+        if not nodes:
+            continue
+        for offset in range(0, len(item_ids), ITEMS_PER_PASS):
+            labels = defaultdict(list)
+            for value in ListItemValue.objects.labels().filter(
+                list_item_id__in=item_ids[offset : offset + ITEMS_PER_PASS]
+            ):
+                labels[str(value.list_item_id)].append(value.serialize())
+            if not labels:
+                continue
+            for node_id, nodegroup_id in nodes:
+                updated, resources = _refresh_node(
+                    str(node_id), nodegroup_id, labels, batch_size
+                )
+                tile_count += updated
+                resource_ids.update(resources)
+
+    if reindex and resource_ids:
+        _reindex_resources(resource_ids, batch_size)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "items": item_count,
+        "tiles": tile_count,
+        "resources": len(resource_ids),
+        "seconds": elapsed,
+    }
+
+
+def _refresh_node(node_id, nodegroup_id, labels, batch_size):
+    quote = connection.ops.quote_name
+    table = quote(TileModel._meta.db_table)
+    tile_id = quote(TileModel._meta.get_field("tileid").column)
+    data = quote(TileModel._meta.get_field("data").column)
+    nodegroup = quote(TileModel._meta.get_field("nodegroup").column)
+    resource = quote(TileModel._meta.get_field("resourceinstance").column)
+
+    # Each reference is matched to its item by the list_item_id of its first
+    # label; references to other items are kept as they are.
+    sql = f"""
+        WITH batch AS (
+            SELECT {tile_id} AS tileid, {data} -> %(node)s AS refs
+            FROM {table}
+            WHERE {nodegroup} = %(nodegroup)s AND {tile_id} > %(after)s
+            ORDER BY {tile_id}
+            LIMIT %(limit)s
+        ),
+        refreshed AS (
+            SELECT batch.tileid,
+                jsonb_agg(
+                    CASE WHEN item.labels IS NULL THEN ref.value
+                    ELSE jsonb_set(ref.value, '{{labels}}', item.labels) END
+                    ORDER BY ref.ordinality
+                ) AS refs,
+                bool_or(NOT (
+                    (ref.value -> 'labels') @> item.labels
+                    AND item.labels @> (ref.value -> 'labels')
+                )) AS stale
+            FROM batch
+            CROSS JOIN LATERAL jsonb_array_elements(batch.refs)
+                WITH ORDINALITY ref(value, ordinality)
+            LEFT JOIN jsonb_each(%(labels)s::jsonb) item(list_item_id, labels)
+                ON item.list_item_id = ref.value -> 'labels' -> 0 ->> 'list_item_id'
+            WHERE jsonb_typeof(batch.refs) = 'array'
+            GROUP BY batch.tileid
+        ),
+        updated AS (
+            UPDATE {table}
+            SET {data} = jsonb_set({data}, ARRAY[%(node)s], refreshed.refs)
+            FROM refreshed
+            WHERE {table}.{tile_id} = refreshed.tileid AND refreshed.stale
+            RETURNING {table}.{resource}
+        )
+        SELECT
+            (SELECT tileid::text FROM batch ORDER BY tileid DESC LIMIT 1),
+            (SELECT count(*) FROM updated),
+            (SELECT array_agg(DISTINCT {resource}::text) FROM updated)
+    """
+    params = {
+        "node": node_id,
+        "nodegroup": nodegroup_id,
+        "after": "00000000-0000-0000-0000-000000000000",
+        "limit": batch_size,
+        "labels": json.dumps(labels),
+    }
+    tile_count = 0
+    resource_ids = set()
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(sql, params)
+            last_tile_id, updated, resources = cursor.fetchone()
+            if last_tile_id is None:
+                break
+            tile_count += updated
+            resource_ids.update(resources or ())
+            params["after"] = last_tile_id
+    return tile_count, resource_ids
+
+
+def _reindex_resources(resource_ids, batch_size):
+    from arches.app.models.resource import Resource
+    from arches.app.utils.index_database import (
+        index_resources_using_singleprocessing,
+    )
+
+    resource_ids = sorted(resource_ids)
+    for start in range(0, len(resource_ids), batch_size):
+        index_resources_using_singleprocessing(
+            Resource.objects.filter(pk__in=resource_ids[start : start + batch_size]),
+            quiet=True,
+            recalculate_descriptors=True,
+        )
+
+
+def queue_reference_label_refresh(list_item_ids):
+    """Refreshes reference labels for `list_item_ids` in a celery worker once
+    the current transaction commits. Tiles are not rewritten in process: when
+    no worker is running, a warning names the management command to run."""
+    list_item_ids = sorted(str(item_id) for item_id in list_item_ids)
+
+    def refresh():
+        if check_if_celery_available():
+            from arches_controlled_lists.tasks import refresh_reference_labels_task
+
+            refresh_reference_labels_task.delay(list_item_ids)
+        else:
+            list_ids = (
+                ListItem.objects.filter(pk__in=list_item_ids)
+                .order_by("list_id")
+                .values_list("list_id", flat=True)
+                .distinct()
+            )
+            logger.warning(
+                "Celery is unavailable, so reference labels of %s list items "
+                "were not refreshed. Run `python manage.py "
+                "refresh_reference_labels --list %s`",
+                len(list_item_ids),
+                " ".join(str(list_id) for list_id in list_ids),
+            )
+
+    transaction.on_commit(refresh)
@@ -1,14 +1,33 @@
+from collections import defaultdict
 from http import HTTPStatus
+from itertools import islice
 from uuid import UUID
 import filetype
+import hashlib
 import json
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Max
+from django.db.models import (
+    Case,
+    Max,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    When,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Length
 from django.db.utils import IntegrityError
+from django.http import StreamingHttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    quote_etag,
+)
 from django.utils.decorators import method_decorator
-from django.utils.translation import gettext as _
+from django.utils.translation import get_language, gettext as _
 
 from arches.app.models.utils import field_names
 from arches.app.utils.betterJSONSerializer import JSONDeserializer
@@ -19,77 +38,213 @@ from arches.app.utils.string_utils import str_to_bool
 from arches.app.views.api import APIBase
 from arches_controlled_lists.models import (
     List,
+    ListChange,
     ListItem,
+    ListItemClosure,
     ListItemImage,
     ListItemImageMetadata,
     ListItemValue,
     NodeProxy,
 )
+from arches_controlled_lists.utils.json_encoding import (
+    ControlledListJSONResponse,
+    dumps,
+)
 from arches_controlled_lists.utils.skos import SKOSReader, SKOSWriter
 
 
-def _prefetch_terms(request):
-    """Children at arbitrary depth will still be returned, but tell
-    the ORM to prefetch a certain depth to mitigate N+1 queries after."""
-    flat = str_to_bool(request.GET.get("flat", "false"))
-
-    # Raising the prefetch depth will only save queries, never cause more.
-    # Might add slight python overhead? ~12-14 is enough for Getty AAT.
-    # https://forum.djangoproject.com/t/prefetching-relations-to-arbitrary-depth/39328
-    prefetch_depth = 1 if flat else 14
-
-    terms = []
-    for i in range(prefetch_depth):
-        terms.extend(
-            [
-                f"list_items{'__children' * i}",
-                f"list_items{'__children' * i}__list_item_values",
-                f"list_items{'__children' * i}__list_item_images",
-                f"list_items{'__children' * i}__list_item_images__list_item_image_metadata",
-            ]
-        )
-    return terms
+def _prefetch_terms(flat=False):
+    """Items at every depth are fetched together by list, and the tree is
+    assembled in memory by `List.serialize_items()`, so the number of queries
+    does not grow with the depth of the list."""
+    return [
+        Prefetch(
+            "list_items",
+            ListItem.objects.order_by("sort_path" if flat else "sortorder"),
+        ),
+        "list_items__list_item_values",
+        "list_items__list_item_images",
+        "list_items__list_item_images__list_item_image_metadata",
+    ]
+
+
+def _get_serialized_items(lists, flat=False, columnar=False):
+    """Returns a mapping of list id to serialized items, cached under the list
+    revision and the active language, which localizes image metadata labels.
+    Nodes are left out: they are filtered per user afterward."""
+    layout = "columnar" if columnar else flat
+    language = get_language()
+    cache_keys = {
+        lst.pk: f"controlled_list_items_{lst.pk}_{lst.revision}_{layout}_{language}"
+        for lst in lists
+    }
+    serialized = cache.get_many(cache_keys.values())
+    uncached = [lst for lst in lists if cache_keys[lst.pk] not in serialized]
+    if uncached:
+        prefetch_related_objects(uncached, *_prefetch_terms(flat or columnar))
+        fresh = {
+            cache_keys[lst.pk]: (
+                lst.serialize_items_columnar()
+                if columnar
+                else lst.serialize_items(flat)
+            )
+            for lst in uncached
+        }
+        cache.set_many(fresh)
+        serialized |= fresh
+    return {list_id: serialized[key] for list_id, key in cache_keys.items()}
+
+
+def _stream_lists(lists, flat, columnar, permitted_nodegroups, batch_size=20):
+    """Yields the same body as `ListsView`, one list at a time. Lists are read
+    from a server-side cursor and their items fetched a batch at a time, so
+    memory does not grow with the number of lists."""
+    yield b'{"controlled_lists": ['
+    separator = b""
+    rows = lists.iterator(chunk_size=batch_size)
+    while batch := list(islice(rows, batch_size)):
+        serialized_items = _get_serialized_items(batch, flat, columnar)
+        for lst in batch:
+            serialized = lst.serialize(
+                permitted_nodegroups=permitted_nodegroups,
+                serialized_items=serialized_items.pop(lst.pk),
+            )
+            yield separator + dumps(serialized)
+            separator = b","
+    yield b"]}"
+
+
+def _make_etag(*parts):
+    """A strong ETag over everything that shapes a response body."""
+    payload = json.dumps(parts, default=str).encode()
+    return quote_etag(hashlib.md5(payload, usedforsecurity=False).hexdigest())
+
+
+def _with_etag(response, etag):
+    """Clients may keep their copy, but must revalidate it (If-None-Match)
+    before reuse."""
+    response.headers["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _serialize_changed_objects(ids_by_model, list_id):
+    """Returns a mapping of (model name, id) to the current serialization of
+    each object that still exists in the list."""
+    querysets = {
+        "list": List.objects.filter(pk=list_id),
+        "listitem": ListItem.objects.filter(list_id=list_id).prefetch_related(
+            "list_item_values",
+            "list_item_images__list_item_image_metadata",
+        ),
+        "listitemvalue": ListItemValue.objects.values_without_images().filter(
+            list_item__list_id=list_id
+        ),
+        "listitemimage": ListItemImage.objects.filter(
+            list_item__list_id=list_id
+        ).prefetch_related("list_item_image_metadata"),
+        "listitemimagemetadata": ListItemImageMetadata.objects.filter(
+            list_item_image__list_item__list_id=list_id
+        ),
+    }
+    serialized = {}
+    for model, object_ids in ids_by_model.items():
+        for obj in querysets[model].filter(pk__in=object_ids):
+            if model == "list":
+                data = {
+                    "id": str(obj.pk),
+                    "name": obj.name,
+                    "dynamic": obj.dynamic,
+                    "searchable": obj.searchable,
+                }
+            elif model == "listitem":
+                data = obj.serialize(flat=True)
+            else:
+                data = obj.serialize()
+            serialized[(model, obj.pk)] = data
+    return serialized
 
 
 class ListsView(APIBase):
     def get(self, request):
-        """Returns either a flat representation (?flat=true) or a tree (default)."""
-        lists = (
-            List.objects.annotate_node_fields(
-                node_ids="pk",
-                node_names="name",
-                nodegroup_ids="nodegroup_id",
-                graph_ids="graph_id",
-                graph_names="graph__name",
-            )
-            .order_by("name")
-            .prefetch_related(*_prefetch_terms(request))
-        )
+        """Returns either a flat representation (?flat=true) or a tree (default),
+        or only list metadata with aggregates over the items (?summary=true).
+        Pass ?stream=true to stream the lists rather than render them at once
+        (no ETag is computed, since that would require a pass over all lists).
+        Pass ?format=columnar for items as parallel arrays (see
+        `List.serialize_items_columnar()`)."""
+        lists = List.objects.annotate_nodes().order_by("name")
 
         flat = str_to_bool(request.GET.get("flat", "false"))
+        summary = str_to_bool(request.GET.get("summary", "false"))
+        columnar = request.GET.get("format") == "columnar"
+        if summary:
+            lists = lists.annotate_item_summary()
         permitted = get_nodegroups_by_perm(request.user, "read_nodegroup")
-        serialized = [
-            obj.serialize(flat=flat, permitted_nodegroups=permitted) for obj in lists
-        ]
+        if not summary and str_to_bool(request.GET.get("stream", "false")):
+            response = StreamingHttpResponse(
+                _stream_lists(lists, flat, columnar, permitted),
+                content_type="application/json",
+            )
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
 
-        return JSONResponse({"controlled_lists": serialized})
+        serialized_nodes = {obj.pk: obj.serialize_nodes(permitted) for obj in lists}
+        etag = _make_etag(
+            flat,
+            summary,
+            columnar,
+            get_language(),
+            [(obj.pk, obj.revision, serialized_nodes[obj.pk]) for obj in lists],
+        )
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+
+        if summary:
+            serialized = [
+                obj.serialize_summary(serialized_nodes=serialized_nodes[obj.pk])
+                for obj in lists
+            ]
+        else:
+            serialized_items = _get_serialized_items(lists, flat, columnar)
+            serialized = [
+                obj.serialize(
+                    serialized_items=serialized_items[obj.pk],
+                    serialized_nodes=serialized_nodes[obj.pk],
+                )
+                for obj in lists
+            ]
+
+        return _with_etag(
+            ControlledListJSONResponse({"controlled_lists": serialized}), etag
+        )
 
 
 class ListView(APIBase):
     def get(self, request, list_id):
-        """Returns either a flat representation (?flat=true) or a tree (default)."""
+        """Returns either a flat representation (?flat=true) or a tree (default),
+        or parallel arrays (?format=columnar)."""
         try:
-            lst = List.objects.prefetch_related(*_prefetch_terms(request)).get(
-                pk=list_id
-            )
+            lst = List.objects.annotate_nodes().get(pk=list_id)
         except List.DoesNotExist:
             return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
 
         flat = str_to_bool(request.GET.get("flat", "false"))
+        columnar = request.GET.get("format") == "columnar"
         permitted = get_nodegroups_by_perm(request.user, "read_nodegroup")
-        serialized = lst.serialize(flat=flat, permitted_nodegroups=permitted)
+        serialized_nodes = lst.serialize_nodes(permitted)
+        etag = _make_etag(
+            flat, columnar, get_language(), lst.pk, lst.revision, serialized_nodes
+        )
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+
+        serialized = lst.serialize(
+            serialized_items=_get_serialized_items([lst], flat, columnar)[lst.pk],
+            serialized_nodes=serialized_nodes,
+        )
 
-        return JSONResponse(serialized)
+        return _with_etag(ControlledListJSONResponse(serialized), etag)
 
     @method_decorator(
         group_required("RDM Administrator", raise_exception=True), name="dispatch"
@@ -201,6 +356,127 @@ class ListView(APIBase):
         return JSONResponse(status=HTTPStatus.NO_CONTENT)
 
 
+class ListItemChildrenView(APIBase):
+    page_size = 100
+    max_page_size = 1000
+
+    def get(self, request, list_id):
+        """Returns one page of the children of ?parent_id (or of the list
+        root), in sortorder, after the sortorder given by ?after."""
+        try:
+            parent_id = request.GET.get("parent_id") or None
+            if parent_id:
+                parent_id = UUID(parent_id)
+            after = request.GET.get("after")
+            after = int(after) if after is not None else None
+            limit = min(
+                int(request.GET.get("limit", self.page_size)), self.max_page_size
+            )
+        except ValueError:
+            return JSONErrorResponse(status=HTTPStatus.BAD_REQUEST)
+        if limit < 1:
+            return JSONErrorResponse(status=HTTPStatus.BAD_REQUEST)
+
+        try:
+            lst = List.objects.get(pk=list_id)
+        except List.DoesNotExist:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+
+        etag = _make_etag(lst.pk, lst.revision, get_language(), parent_id, after, limit)
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+
+        children = ListItem.objects.filter(list=lst, parent_id=parent_id)
+        if after is not None:
+            children = children.filter(sortorder__gt=after)
+        # Fetch one extra item to learn whether there is a next page.
+        page = list(
+            children.with_child_count()
+            .order_by("sortorder")
+            .prefetch_related(
+                "list_item_values",
+                "list_item_images",
+                "list_item_images__list_item_image_metadata",
+            )[: limit + 1]
+        )
+        has_next = len(page) > limit
+        page = page[:limit]
+
+        serialized = []
+        for item in page:
+            item_data = item.serialize(flat=True)
+            item_data["child_count"] = item.child_count
+            item_data["has_children"] = item.child_count > 0
+            serialized.append(item_data)
+
+        return _with_etag(
+            ControlledListJSONResponse(
+                {
+                    "items": serialized,
+                    "next": page[-1].sortorder if has_next else None,
+                }
+            ),
+            etag,
+        )
+
+
+class ListChangesView(APIBase):
+    def get(self, request, list_id):
+        """Returns the latest change to each object in the list since revision
+        ?since, along with the object's current serialization (if it still
+        exists in the list), and the list's current revision to pass as ?since
+        next time.
+
+        If the list was deleted since (and perhaps recreated with the same id),
+        `reset` is true and only changes from the deletion on are returned:
+        clients should discard what they hold of the list before applying them.
+        """
+        try:
+            since = int(request.GET.get("since", 0))
+        except ValueError:
+            return JSONErrorResponse(status=HTTPStatus.BAD_REQUEST)
+
+        changes = ListChange.objects.filter(list_id=list_id, revision__gt=since)
+        deleted_at = changes.filter(
+            model="list", action=ListChange.Action.DELETE
+        ).aggregate(revision=Max("revision"))["revision"]
+        if deleted_at is not None:
+            changes = changes.filter(revision__gte=deleted_at)
+        changes = changes.order_by("pk")
+        latest_changes = {
+            (change.model, change.object_id): change for change in changes
+        }
+        revision = (
+            List.objects.filter(pk=list_id).values_list("revision", flat=True).first()
+        )
+        if revision is None:
+            if not latest_changes:
+                return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+            revision = max(change.revision for change in latest_changes.values())
+
+        ids_by_model = defaultdict(list)
+        for model, object_id in latest_changes:
+            ids_by_model[model].append(object_id)
+        current_objects = _serialize_changed_objects(ids_by_model, list_id)
+
+        serialized = []
+        for key, change in sorted(latest_changes.items(), key=lambda pair: pair[1].pk):
+            change_data = change.serialize()
+            change_data["data"] = current_objects.get(key)
+            if change_data["data"] is None:
+                # Deleted since, e.g. along with a parent item.
+                change_data["action"] = ListChange.Action.DELETE
+            serialized.append(change_data)
+
+        return ControlledListJSONResponse(
+            {
+                "revision": revision,
+                "reset": deleted_at is not None,
+                "changes": serialized,
+            }
+        )
+
+
 @method_decorator(
     group_required("RDM Administrator", raise_exception=True), name="dispatch"
 )
@@ -286,18 +562,20 @@ class ListItemView(APIBase):
         if not update_fields:
             return JSONErrorResponse(status=HTTPStatus.BAD_REQUEST)
         exclude_fields = field_names(item) - update_fields
+        if item.parent_id and "parent_id" in update_fields:
+            if (
+                str(item.parent_id) == str(item.pk)
+                or ListItem.objects.descendants_of(item)
+                .filter(pk=item.parent_id)
+                .exists()
+            ):
+                return JSONErrorResponse(
+                    message=_("Recursive structure detected."),
+                    status=HTTPStatus.BAD_REQUEST,
+                )
         try:
             item.full_clean(exclude=exclude_fields)
-            with transaction.atomic():
-                item.save(update_fields=update_fields)
-                if "parent_id" in update_fields:
-                    # Check for recursive structure
-                    unused = item.parent.serialize()
-        except RecursionError:
-            return JSONErrorResponse(
-                message=_("Recursive structure detected."),
-                status=HTTPStatus.BAD_REQUEST,
-            )
+            item.save(update_fields=update_fields)
         except ValidationError as ve:
             return JSONErrorResponse(
                 message="\n".join(ve.messages), status=HTTPStatus.BAD_REQUEST
@@ -439,26 +717,226 @@ class ListItemImageMetadataView(APIBase):
         return JSONResponse(status=HTTPStatus.NO_CONTENT)
 
 
+def _get_node_list(graph_slug, node_alias):
+    """Returns the id and revision of the list a node is configured to use,
+    or (None, None), in one query."""
+    controlled_list_id = (
+        NodeProxy.objects.filter(
+            alias=node_alias, graph__slug=graph_slug, source_identifier=None
+        )
+        .with_controlled_lists()
+        .values("controlled_list_id")[:1]
+    )
+    return (
+        List.objects.filter(pk=controlled_list_id).values_list("pk", "revision").first()
+    ) or (None, None)
+
+
+def _get_list_options(revisions, language, lean=False):
+    """Returns a mapping of list id to select options in `language`, cached
+    under the list revision. `revisions` maps list ids to revisions; the
+    items of every uncached list are fetched together."""
+    layout = "lean" if lean else "full"
+    cache_keys = {
+        list_id: f"controlled_list_options_{list_id}_{revision}_{language}_{layout}"
+        for list_id, revision in revisions.items()
+    }
+    serialized = cache.get_many(cache_keys.values())
+    uncached = [list_id for list_id, key in cache_keys.items() if key not in serialized]
+    if uncached:
+        fresh = {cache_keys[list_id]: [] for list_id in uncached}
+        for root_item in ListItem.objects.filter(
+            list_id__in=uncached, parent=None
+        ).fetch_subtrees(lean):
+            fresh[cache_keys[root_item.list_id]].append(
+                root_item.build_select_option(lean)
+            )
+        cache.set_many(fresh)
+        serialized |= fresh
+    return {list_id: serialized[key] for list_id, key in cache_keys.items()}
+
+
 class ListOptionsView(APIBase):
     def get(self, request):
         node_alias = request.GET.get("node_alias")
         graph_slug = request.GET.get("graph_slug")
+        lean = str_to_bool(request.GET.get("lean", "false"))
+
+        list_id, revision = _get_node_list(graph_slug, node_alias)
+        # Display values are localized, so the language shapes the body, too.
+        language = get_language()
+        etag = _make_etag(list_id, revision, language, lean)
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+
+        # The node is resolved to its list on every request, so a node
+        # reconfigured to use another list reads from another cache entry.
+        if list_id is None:
+            serialized = []
+        else:
+            serialized = _get_list_options({list_id: revision}, language, lean)[list_id]
+        return _with_etag(ControlledListJSONResponse(serialized), etag)
 
-        controlled_list_id = (
-            NodeProxy.objects.filter(
-                alias=node_alias, graph__slug=graph_slug, source_identifier=None
+
+class ListOptionsBatchView(APIBase):
+    def get(self, request):
+        """Returns the options of every list used by the nodes given as
+        repeated ?node_alias in the graph ?graph_slug, once per list, plus a
+        mapping of node alias to list id (None if the node has no list)."""
+        node_aliases = request.GET.getlist("node_alias")
+        graph_slug = request.GET.get("graph_slug")
+        lean = str_to_bool(request.GET.get("lean", "false"))
+
+        list_revision = List.objects.filter(pk=OuterRef("controlled_list_id")).values(
+            "revision"
+        )
+        node_lists = {
+            alias: (list_id, revision)
+            for alias, list_id, revision in NodeProxy.objects.filter(
+                alias__in=node_aliases, graph__slug=graph_slug, source_identifier=None
             )
             .with_controlled_lists()
-            .values("controlled_list_id")[:1]
+            .annotate(revision=Subquery(list_revision))
+            .values_list("alias", "controlled_list_id", "revision")
+            # A node may reference a list that no longer exists.
+            if revision is not None
+        }
+        revisions = dict(node_lists.values())
+        language = get_language()
+        etag = _make_etag(node_aliases, sorted(node_lists.items()), language, lean)
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+
+        serialized = _get_list_options(revisions, language, lean)
+        return _with_etag(
+            ControlledListJSONResponse(
+                {
+                    "nodes": {
+                        alias: (
+                            str(node_lists[alias][0]) if alias in node_lists else None
+                        )
+                        for alias in node_aliases
+                    },
+                    "lists": {
+                        str(list_id): options for list_id, options in serialized.items()
+                    },
+                }
+            ),
+            etag,
         )
 
-        list_items = ListItem.objects.filter(
-            list_id=controlled_list_id
-        ).with_list_item_labels()
-        serialized = [
-            item.build_select_option() for item in list_items if item.parent_id is None
-        ]
-        return JSONResponse(serialized)
+
+class ListItemLabelsView(APIBase):
+    def get(self, request, item_id):
+        """Returns the labels of an item, for clients of the lean options."""
+        revision = (
+            ListItem.objects.filter(pk=item_id)
+            .values_list("list__revision", flat=True)
+            .first()
+        )
+        if revision is None:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+        etag = _make_etag(item_id, revision)
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+
+        labels = ListItemValue.objects.labels().filter(list_item_id=item_id)
+        return _with_etag(
+            ControlledListJSONResponse([label.serialize() for label in labels]),
+            etag,
+        )
+
+
+class ListOptionsSearchView(APIBase):
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        """Returns the items in a node's list with a label containing ?term,
+        best matches (labels starting with the term, then shorter labels)
+        first, optionally matching only labels in ?language. Each result is
+        a select option without children, plus the path of its ancestors."""
+        node_alias = request.GET.get("node_alias")
+        graph_slug = request.GET.get("graph_slug")
+        term = request.GET.get("term", "").strip()
+        match_language = request.GET.get("language") or None
+        try:
+            limit = min(
+                int(request.GET.get("limit", self.default_limit)), self.max_limit
+            )
+        except ValueError:
+            return JSONErrorResponse(status=HTTPStatus.BAD_REQUEST)
+        if limit < 1:
+            return JSONErrorResponse(status=HTTPStatus.BAD_REQUEST)
+
+        list_id, revision = _get_node_list(graph_slug, node_alias)
+        language = get_language()
+        etag = _make_etag(list_id, revision, language, term, match_language, limit)
+        if not_modified := get_conditional_response(request, etag=etag):
+            return _with_etag(not_modified, etag)
+        if list_id is None or not term:
+            return _with_etag(ControlledListJSONResponse([]), etag)
+
+        match_rank = {
+            "starts_with_term": Case(
+                When(value__istartswith=term, then=False), default=True
+            ),
+            "length": Length("value"),
+        }
+        matching_labels = ListItemValue.objects.labels().filter(
+            list_item__list_id=list_id, value__icontains=term
+        )
+        if match_language:
+            matching_labels = matching_labels.filter(language_id=match_language)
+        # The best matching label of each item, then the best items overall.
+        best_label_per_item = (
+            matching_labels.annotate(**match_rank)
+            .order_by("list_item_id", *match_rank, "value")
+            .distinct("list_item_id")
+        )
+        matches = list(
+            ListItemValue.objects.filter(pk__in=best_label_per_item.values("pk"))
+            .annotate(**match_rank)
+            .order_by(*match_rank, "value")[:limit]
+        )
+
+        item_ids = [match.list_item_id for match in matches]
+        items = ListItem.objects.filter(pk__in=item_ids).with_list_item_labels()
+        items_by_id = {item.pk: item for item in items}
+        ancestor_ids = defaultdict(list)
+        for item_id, ancestor_id in (
+            ListItemClosure.objects.filter(descendant__in=item_ids, depth__gt=0)
+            .order_by("descendant", "-depth")
+            .values_list("descendant_id", "ancestor_id")
+        ):
+            ancestor_ids[item_id].append(ancestor_id)
+        display_values = ListItem.objects.filter(
+            pk__in={*item_ids, *(pk for ids in ancestor_ids.values() for pk in ids)}
+        ).best_labels(language)
+
+        serialized = []
+        for match in matches:
+            item = items_by_id[match.list_item_id]
+            serialized.append(
+                {
+                    "list_item_id": str(item.pk),
+                    "uri": item.uri,
+                    "list_item_values": [
+                        label.serialize() for label in item.list_item_labels
+                    ],
+                    "display_value": display_values.get(item.pk),
+                    "sortorder": item.sortorder,
+                    "matched_value": match.value,
+                    "ancestors": [
+                        {
+                            "list_item_id": str(ancestor_id),
+                            "display_value": display_values.get(ancestor_id),
+                        }
+                        for ancestor_id in ancestor_ids[item.pk]
+                    ],
+                }
+            )
+        return _with_etag(ControlledListJSONResponse(serialized), etag)
 
 
 class ListItemCopyView(APIBase):
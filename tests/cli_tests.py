@@ -6,7 +6,7 @@ from django.test import TestCase
 from django.test.utils import captured_stdout
 from django.core.management.base import CommandError
 
-from arches.app.models.models import Node
+from arches.app.models.models import Node, ResourceInstance, TileModel
 from arches_controlled_lists.models import List, ListItem, ListItemValue
 
 from .test_settings import PROJECT_TEST_ROOT
@@ -345,3 +345,48 @@ class MigrateConceptNodesToReferenceDatatypeTests(TestCase):
             stderr=output,
         )
         self.assertEqual(output.getvalue().strip(), expected_output)
+
+
+class RefreshReferenceLabelsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from tests.test_views import ListTests
+
+        return ListTests.setUpTestData()
+
+    def test_refresh_reference_labels(self):
+        from tests.test_views import ListTests
+
+        node = ListTests.node_using_list1
+        item = ListTests.list1.list_items.get(sortorder=0)
+        other_item = ListTests.list1.list_items.get(sortorder=1)
+        stale = item.build_tile_value()
+        stale["labels"][0]["value"] = "Stale"
+        current = other_item.build_tile_value()
+        resource = ResourceInstance.objects.create(graph=ListTests.graph)
+        tile = TileModel.objects.create(
+            resourceinstance=resource,
+            nodegroup=node.nodegroup,
+            data={str(node.pk): [stale, current]},
+        )
+
+        output = io.StringIO()
+        management.call_command(
+            "refresh_reference_labels",
+            list_ids=[str(ListTests.list1.pk)],
+            skip_indexing=True,
+            stdout=output,
+        )
+
+        tile.refresh_from_db()
+        self.assertEqual(tile.data[str(node.pk)], [item.build_tile_value(), current])
+        self.assertIn("in 1 tiles of 1 resources", output.getvalue())
+
+        output = io.StringIO()
+        management.call_command(
+            "refresh_reference_labels",
+            item_ids=[str(item.pk)],
+            skip_indexing=True,
+            stdout=output,
+        )
+        self.assertIn("in 0 tiles of 0 resources", output.getvalue())
@@ -1,4 +1,5 @@
 import uuid
+from dataclasses import asdict
 from types import SimpleNamespace
 from unittest.mock import Mock
 
@@ -11,8 +12,10 @@ from arches_controlled_lists.datatypes.datatypes import (
     Reference,
     ReferenceDataType,
     ReferenceLabel,
+    clear_node_configs,
 )
 from arches_controlled_lists.models import List, ListItem, ListItemValue
+from arches_controlled_lists.utils.label_lookup import _build_label_index
 
 from tests.test_views import ListTests
 
@@ -186,6 +189,45 @@ class ReferenceDataTypeTests(TestCase):
         # Also test None.
         self.assertIsNone(reference.serialize(None))
 
+    def test_validate_many(self):
+        reference = DataTypeFactory().get_instance("reference")
+        node = Node.objects.get(pk=ListTests.node_using_list1.pk)
+        value = self.get_mock_tile().data[str(node.pk)]
+        clear_node_configs()
+
+        with self.assertNumQueries(1):
+            errors = reference.validate_many(
+                [value, value + value, None], nodeid=node.pk
+            )
+
+        self.assertEqual(errors[0], [])
+        self.assertEqual(
+            errors[1][0]["message"], "This node does not allow multiple references."
+        )
+        self.assertEqual(errors[2], [])
+
+        # Saving the node clears the cached config.
+        node.config["multiValue"] = True
+        node.save()
+        self.assertEqual(reference.validate(value + value, nodeid=node.pk), [])
+
+        # A batch reads the config afresh, e.g. if changed in another process.
+        node.config["multiValue"] = False
+        Node.objects.filter(pk=node.pk).update(config=node.config)
+        self.assertEqual(reference.validate(value + value, nodeid=node.pk), [])
+        errors = reference.validate_many([value + value], nodeid=node.pk)
+        self.assertEqual(
+            errors[0][0]["message"], "This node does not allow multiple references."
+        )
+
+    def test_to_python_and_serialize(self):
+        reference = DataTypeFactory().get_instance("reference")
+        node_value = self.get_mock_tile().data[str(ListTests.node_using_list1.pk)]
+
+        parsed = reference.to_python(node_value)
+        self.assertIs(reference.to_python(parsed)[0], parsed[0])
+        self.assertEqual(reference.serialize(parsed), [asdict(parsed[0])])
+
     def test_transform_value_for_tile(self):
         reference = DataTypeFactory().get_instance("reference")
         list1_pk = str(List.objects.get(name="list1").pk)
@@ -221,6 +263,74 @@ class ReferenceDataTypeTests(TestCase):
             tile_value2[0]["labels"][0]["list_item_id"], expected_list_item_pk
         )
 
+    def test_transform_values_for_tile(self):
+        reference = DataTypeFactory().get_instance("reference")
+        list1 = List.objects.get(name="list1")
+        config = {"controlledList": str(list1.pk)}
+        item_ids = {item.pk: item.sortorder for item in list1.list_items.all()}
+        item0_pk = next(pk for pk, sortorder in item_ids.items() if sortorder == 0)
+        column = [
+            "label1-pref",
+            "label2-pref,label3-alt",
+            str(item0_pk),
+            None,
+            "not a label",
+        ] * 100
+
+        # Build the label index of the list.
+        reference.transform_values_for_tile(column[4:5], **config)
+        with self.assertNumQueries(4):
+            # 1: exact labels
+            # 2: revision of the label index, for "not a label"
+            # 3-4: items by id, prefetch labels
+            tile_values = reference.transform_values_for_tile(column, **config)
+
+        self.assertEqual(len(tile_values), len(column))
+        self.assertEqual(
+            tile_values[:5],
+            [
+                reference.transform_value_for_tile(value, **config)
+                for value in column[:5]
+            ],
+        )
+        self.assertEqual(len(tile_values[1]), 2)
+        self.assertEqual(tile_values[2][0]["labels"][0]["list_item_id"], str(item0_pk))
+        self.assertIsNone(tile_values[3])
+        self.assertEqual(tile_values[4], [])
+
+    def test_lookup_listitem_ids_from_labels(self):
+        reference = DataTypeFactory().get_instance("reference")
+        list1 = List.objects.get(name="list1")
+        item1 = list1.list_items.get(list_item_values__value="label1-pref")
+
+        self.assertEqual(
+            reference.lookup_listitem_ids_from_labels(
+                ["label1-pref", " LABEL1-PREF ", "label1-prèf", "nope"], list1.pk
+            ),
+            {
+                "label1-pref": item1.pk,
+                " LABEL1-PREF ": item1.pk,
+                "label1-prèf": item1.pk,
+            },
+        )
+
+        # Exact labels are read directly, without building the index.
+        _build_label_index.cache_clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                reference.lookup_listitem_ids_from_labels(["label1-pref"], list1.pk),
+                {"label1-pref": item1.pk},
+            )
+        self.assertEqual(_build_label_index.cache_info().currsize, 0)
+
+        # The index follows changes to the list.
+        ListItemValue.objects.filter(value="label1-pref", list_item=item1).update(
+            value="renamed"
+        )
+        self.assertEqual(
+            reference.lookup_listitem_ids_from_labels(["label1-pref"], list1.pk), {}
+        )
+
     def test_to_json(self):
         reference = DataTypeFactory().get_instance("reference")
         node = ListTests.node_using_list1
@@ -269,19 +379,30 @@ class ReferenceDataTypeTests(TestCase):
         node_value = mock_tile.data[str(node.pk)]
         five_identical_node_values = [node_value] * 5
 
-        qs = reference.get_display_value_context_in_bulk(five_identical_node_values)
         with self.assertNumQueries(3):
-            # 1: list items
-            # 2: list item labels
-            # 3: children
-            self.assertEqual(len(qs), 1)
+            # 1: list item ids
+            # 2: list items and their descendants
+            # 3: list item labels
+            items = reference.get_display_value_context_in_bulk(
+                five_identical_node_values
+            )
+        self.assertEqual(len(items), 1)
         with self.assertNumQueries(0):
-            qs[0].build_select_option()
+            (item,) = items.values()
+            item.build_select_option()
 
     def test_get_details(self):
         reference = DataTypeFactory().get_instance("reference")
         node = ListTests.node_using_list1
         mock_tile = self.get_mock_tile()
+        node_value = mock_tile.data[str(node.pk)]
+        context = reference.get_display_value_context_in_bulk([node_value])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                reference.get_details(node_value, datatype_context=context),
+                reference.get_details(node_value, datatype_context=context),
+            )
+
         details = reference.get_details(mock_tile.data[str(node.pk)])
         self.assertEqual(
             set(details[0]),
@@ -353,6 +474,46 @@ class ReferenceDataTypeTests(TestCase):
         self.assertEqual(document["strings"][0]["nodegroup_id"], tile.nodegroup_id)
         self.assertFalse(document["strings"][0]["provisional"])
 
+    def test_append_to_document_deduplicates(self):
+        datatype = DataTypeFactory().get_instance("reference")
+        tile = TileModel(nodegroup_id=uuid.uuid4())
+        document = {"strings": []}
+        list_item_id = uuid.uuid4()
+        labels = [
+            ReferenceLabel(
+                id=uuid.uuid4(),
+                value=value,
+                language_id=language,
+                valuetype_id=valuetype,
+                list_item_id=list_item_id,
+            )
+            for value, language, valuetype in [
+                ("Label", "en", "prefLabel"),
+                ("Label", "en-US", "prefLabel"),
+                ("Etikett", "de", "prefLabel"),
+                ("Other label", "en", "altLabel"),
+            ]
+        ]
+        reference = Reference(
+            uri="http://example.com", labels=labels, list_id=uuid.uuid4()
+        )
+        nodevalue = datatype.serialize([reference, reference])
+
+        datatype.append_to_document(document, nodevalue, uuid.uuid4(), tile)
+
+        self.assertEqual(len(document["references"]), 1)
+        self.assertEqual(
+            document["references"][0]["label_ids"], [label.id for label in labels]
+        )
+        self.assertEqual(
+            [string["string"] for string in document["strings"]],
+            ["Label", "Etikett", "Other label"],
+        )
+
+        # A reference already in the document is not added again.
+        datatype.append_to_document(document, nodevalue, uuid.uuid4(), tile)
+        self.assertEqual(len(document["references"]), 1)
+
     def test_append_search_filters(self):
         mock_node = Mock(Node)
         mock_query = Mock(Bool)
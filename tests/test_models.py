@@ -1,12 +1,18 @@
 import time
+from unittest import mock
 
 from django.conf import settings
 from django.test import TestCase
 
-from arches.app.models.models import DValueType
+from arches.app.models.models import DValueType, Language
 from arches.app.search.elasticsearch_dsl_builder import Query
 from arches.app.search.search_engine_factory import SearchEngineInstance
-from arches_controlled_lists.models import List, ListItem, ListItemValue
+from arches_controlled_lists.models import (
+    List,
+    ListItem,
+    ListItemBestLabel,
+    ListItemValue,
+)
 
 
 # these tests can be run from the command line via
@@ -56,6 +62,266 @@ class ListItemGetChildUrisTests(TestCase):
         uris = self.child_item_1.get_child_uris()
         self.assertEqual(uris, [self.child_item_1.uri])
 
+    def test_descendants_and_ancestors(self):
+        grandchild = ListItem.objects.create(
+            list=self.list,
+            parent=self.child_item_1,
+            sortorder=0,
+            uri="http://example.com/grandchild",
+        )
+        self.assertQuerySetEqual(
+            ListItem.objects.descendants_of(self.parent_item),
+            [self.child_item_1, grandchild, self.child_item_2],
+        )
+        self.assertQuerySetEqual(
+            ListItem.objects.ancestors_of(grandchild, include_self=True),
+            [self.parent_item, self.child_item_1, grandchild],
+        )
+
+        # Moving a subtree moves its descendants along with it.
+        self.child_item_1.parent = self.child_item_2
+        ListItem.objects.bulk_update([self.child_item_1], fields=["parent"])
+        self.assertQuerySetEqual(
+            ListItem.objects.ancestors_of(grandchild),
+            [self.parent_item, self.child_item_2, self.child_item_1],
+        )
+
+    def test_build_select_option_from_fetched_subtree(self):
+        ListItem.objects.create(
+            list=self.list,
+            parent=self.child_item_2,
+            sortorder=0,
+            uri="http://example.com/grandchild",
+        )
+        with self.assertNumQueries(3):
+            (parent,) = ListItem.objects.filter(pk=self.parent_item.pk).fetch_subtrees()
+        with self.assertNumQueries(0):
+            option = parent.build_select_option()
+
+        self.assertEqual(
+            [child["uri"] for child in option["children"]],
+            [self.child_item_1.uri, self.child_item_2.uri],
+        )
+        self.assertEqual(
+            option["children"][1]["children"][0]["uri"],
+            "http://example.com/grandchild",
+        )
+
+
+class ListItemSortPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.list = List.objects.create(name="Test List")
+        cls.parent_item = ListItem.objects.create(
+            list=cls.list, sortorder=3, uri="http://example.com/parent"
+        )
+        cls.child_item = ListItem.objects.create(
+            list=cls.list,
+            parent=cls.parent_item,
+            sortorder=1,
+            uri="http://example.com/child",
+        )
+
+    def test_sort_path_maintained_on_save(self):
+        self.child_item.refresh_from_db()
+        self.assertEqual(self.parent_item.sort_path, [3])
+        self.assertEqual(self.child_item.sort_path, [3, 1])
+
+    def test_sort_path_maintained_on_bulk_update(self):
+        self.parent_item.sortorder = 0
+        ListItem.objects.bulk_update([self.parent_item], fields=["sortorder"])
+        self.child_item.refresh_from_db()
+        self.assertEqual(self.child_item.sort_path, [0, 1])
+
+    def test_sort_path_maintained_on_bulk_create(self):
+        (grandchild,) = ListItem.objects.bulk_create(
+            [
+                ListItem(
+                    list=self.list,
+                    parent=self.child_item,
+                    sortorder=7,
+                    uri="http://example.com/grandchild",
+                )
+            ]
+        )
+        self.assertEqual(grandchild.sort_path, [3, 1, 7])
+
+
+class ListRevisionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.list = List.objects.create(name="Test List")
+        cls.item = ListItem.objects.create(
+            list=cls.list, sortorder=0, uri="http://example.com/item"
+        )
+
+    def test_revision_bumped_by_value_changes(self):
+        revision = List.objects.get(pk=self.list.pk).revision
+        ListItemValue.objects.create(
+            list_item=self.item,
+            valuetype_id="prefLabel",
+            language_id="en",
+            value="Label",
+        )
+        self.assertGreater(List.objects.get(pk=self.list.pk).revision, revision)
+
+    def test_revision_bumped_by_item_deletion(self):
+        revision = List.objects.get(pk=self.list.pk).revision
+        ListItem.objects.filter(pk=self.item.pk).delete()
+        self.assertGreater(List.objects.get(pk=self.list.pk).revision, revision)
+
+    def test_stale_save_does_not_rewind_revision(self):
+        stale = List.objects.get(pk=self.list.pk)
+        List.objects.filter(pk=self.list.pk).bump_revision()
+        revision = List.objects.get(pk=self.list.pk).revision
+
+        stale.name = "Renamed"
+        stale.save()
+        self.assertGreater(stale.revision, revision)
+        self.assertEqual(List.objects.get(pk=self.list.pk).revision, stale.revision)
+
+    def test_save_with_empty_update_fields_is_a_no_op(self):
+        revision = List.objects.get(pk=self.list.pk).revision
+        self.list.name = "Renamed"
+        self.list.save(update_fields=set())
+        refreshed = List.objects.get(pk=self.list.pk)
+        self.assertEqual(refreshed.name, "Test List")
+        self.assertEqual(refreshed.revision, revision)
+
+    def test_recreated_list_does_not_reuse_revisions(self):
+        self.list.save()
+        list_id, revision = self.list.pk, self.list.revision
+        self.list.delete()
+
+        (recreated,) = List.objects.bulk_create([List(id=list_id, name="Test List")])
+        self.assertGreater(recreated.revision, revision)
+
+
+class ListItemBestLabelTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.list = List.objects.create(name="Test List")
+        cls.item = ListItem.objects.create(
+            list=cls.list, sortorder=0, uri="http://example.com/item"
+        )
+        ListItemValue.objects.create(
+            list_item=cls.item,
+            valuetype_id="prefLabel",
+            language_id="en",
+            value="English PrefLabel",
+        )
+
+    def test_best_labels_maintained_on_value_changes(self):
+        items = ListItem.objects.filter(pk=self.item.pk)
+        self.assertEqual(items.best_labels("en"), {self.item.pk: "English PrefLabel"})
+
+        alt_label = ListItemValue.objects.create(
+            list_item=self.item,
+            valuetype_id="altLabel",
+            language_id="en",
+            value="English AltLabel",
+        )
+        alt_label.valuetype_id = "prefLabel"
+        ListItemValue.objects.filter(value="English PrefLabel").delete()
+        alt_label.save()
+
+        with self.assertNumQueries(1):
+            best_labels = items.best_labels("en")
+        self.assertEqual(best_labels, {self.item.pk: "English AltLabel"})
+
+    def test_best_labels_precomputed_for_new_language(self):
+        Language.objects.create(
+            code="eo",
+            name="Esperanto",
+            default_direction="ltr",
+            isdefault=False,
+            scope="system",
+        )
+        with self.assertNumQueries(1):
+            best_labels = ListItem.objects.filter(pk=self.item.pk).best_labels("eo")
+        self.assertEqual(best_labels, {self.item.pk: "English PrefLabel"})
+
+    def test_lean_subtrees_rank_missing_best_labels_in_bulk(self):
+        ListItem.objects.create(
+            list=self.list, parent=self.item, sortorder=0, uri="http://example.com/2"
+        )
+        ListItemBestLabel.objects.all().delete()
+        with self.assertNumQueries(3):
+            # 1: requested ids
+            # 2: subtree with best labels (none)
+            # 3: labels to rank from
+            (item,) = ListItem.objects.filter(pk=self.item.pk).fetch_subtrees(lean=True)
+        self.assertEqual(item.best_label, "English PrefLabel")
+
+
+class ReferenceLabelRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.list = List.objects.create(name="Test List")
+        cls.item = ListItem.objects.create(
+            list=cls.list, sortorder=0, uri="http://example.com/item"
+        )
+
+    @mock.patch(
+        "arches_controlled_lists.utils.reference_labels.check_if_celery_available",
+        return_value=True,
+    )
+    @mock.patch("arches_controlled_lists.tasks.refresh_reference_labels_task.delay")
+    def test_label_writes_queue_refresh(self, delay, _celery_available):
+        item_ids = [str(self.item.pk)]
+        with self.captureOnCommitCallbacks(execute=True):
+            note = ListItemValue.objects.create(
+                list_item=self.item,
+                valuetype_id="scopeNote",
+                language_id="en",
+                value="Note",
+            )
+        delay.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ListItemValue.objects.bulk_create(
+                [
+                    ListItemValue(
+                        list_item=self.item,
+                        valuetype_id="prefLabel",
+                        language_id="en",
+                        value="Label",
+                    )
+                ]
+            )
+        delay.assert_called_once_with(item_ids)
+
+        delay.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            note.valuetype_id = "altLabel"
+            note.save()
+        delay.assert_called_once_with(item_ids)
+
+        delay.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            ListItemValue.objects.filter(list_item=self.item).update(value="Renamed")
+        delay.assert_called_once_with(item_ids)
+
+    @mock.patch(
+        "arches_controlled_lists.utils.reference_labels.check_if_celery_available",
+        return_value=False,
+    )
+    @mock.patch("arches_controlled_lists.utils.reference_labels._refresh_node")
+    def test_refresh_not_run_in_process_without_celery(
+        self, refresh_node, _celery_available
+    ):
+        with (
+            self.captureOnCommitCallbacks(execute=True),
+            self.assertLogs("arches_controlled_lists.utils.reference_labels"),
+        ):
+            ListItemValue.objects.create(
+                list_item=self.item,
+                valuetype_id="prefLabel",
+                language_id="en",
+                value="Label",
+            )
+        refresh_node.assert_not_called()
+
 
 class ListIndexTests(TestCase):
     @classmethod
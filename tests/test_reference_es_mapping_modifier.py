@@ -41,7 +41,7 @@ class TestReferencesEsMappingModifier(TestCase):
         expected_definition = {
             "type": "nested",
             "properties": {
-                "id": {"type": "keyword"},
+                "label_ids": {"type": "keyword"},
                 "uri": {"type": "keyword"},
                 "list_id": {"type": "keyword"},
                 "nodegroup_id": {"type": "keyword"},
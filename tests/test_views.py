@@ -181,20 +181,16 @@ class ListTests(TestCase):
 
     def test_get_lists(self):
         self.client.force_login(self.admin)
-        with self.assertNumQueries(14):
+        with self.assertNumQueries(10):
             # 1: session
             # 2: auth
-            # 3: SELECT FROM lists
-            # 4: prefetch items
-            # 5: prefetch item labels/images
-            # 7: prefetch image metadata
-            # 8: prefetch children: items
-            # 9: prefetch children: item labels/images
-            # 10: prefetch children: image metadata
-            # 11: prefetch grandchildren: items
-            # there are no grandchildren, so no values/metadata to get
-            # 12: get permitted nodegroups
-            # 13-14: permission checks
+            # 3: get permitted nodegroups
+            # 4-5: permission checks
+            # 6: SELECT FROM lists
+            # 7: prefetch items (at every depth)
+            # 8: prefetch item values
+            # 9: prefetch item images
+            # 10: prefetch image metadata
             response = self.client.get(reverse("controlled_lists"))
 
         self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
@@ -221,6 +217,333 @@ class ListTests(TestCase):
         self.assertEqual(len(second_list["items"]), 1)
         self.assertEqual(len(second_list["items"][0]["children"]), 4)
 
+    def test_get_lists_streamed(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("controlled_lists"))
+        streamed_response = self.client.get(
+            reverse("controlled_lists"), {"stream": True}
+        )
+
+        self.assertTrue(streamed_response.streaming)
+        streamed = json.loads(b"".join(streamed_response.streaming_content))
+        self.assertEqual(streamed, response.json())
+
+    def test_get_lists_summary(self):
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(6):
+            # 1: session
+            # 2: auth
+            # 3: get permitted nodegroups
+            # 4-5: permission checks
+            # 6: SELECT FROM lists, with item aggregates
+            response = self.client.get(reverse("controlled_lists"), {"summary": True})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        first_list, second_list = response.json()["controlled_lists"]
+        self.assertNotIn("items", first_list)
+        self.assertEqual(first_list["item_count"], 5)
+        self.assertEqual(first_list["max_depth"], 0)
+        self.assertEqual(second_list["max_depth"], 1)
+        # The image on the first list has no language.
+        self.assertEqual(first_list["languages"], [self.first_language.code])
+        self.assertEqual(second_list["languages"], [self.first_language.code])
+        self.assertEqual(len(first_list["nodes"]), 1)
+
+    def test_get_list_queries_independent_of_depth(self):
+        grandchild = ListItem.objects.create(
+            list=self.list2,
+            parent=self.parent.children.first(),
+            sortorder=0,
+            uri="https://getty.edu/grandchild",
+        )
+        ListItem.objects.create(
+            list=self.list2,
+            parent=grandchild,
+            sortorder=0,
+            uri="https://getty.edu/great-grandchild",
+        )
+        self.client.force_login(self.admin)
+
+        with self.assertNumQueries(9):
+            # 1: session
+            # 2: auth
+            # 3: SELECT FROM lists, with nodes using list
+            # 4: get permitted nodegroups
+            # 5-6: permission checks
+            # 7-9: prefetch items, values, images (no images: no metadata)
+            response = self.client.get(
+                reverse("controlled_list", kwargs={"list_id": str(self.list2.pk)}),
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        first_child = response.json()["items"][0]["children"][0]
+        self.assertEqual(first_child["children"][0]["depth"], 2)
+        self.assertEqual(
+            first_child["children"][0]["children"][0]["uri"],
+            "https://getty.edu/great-grandchild",
+        )
+
+    def test_get_list_columnar(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("controlled_list", kwargs={"list_id": str(self.list2.pk)}),
+            {"format": "columnar"},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        items = response.json()["items"]
+
+        self.assertEqual(items["id"][0], str(self.parent.pk))
+        self.assertEqual(items["parent"], [None, 0, 0, 0, 0])
+        self.assertEqual(items["depth"], [0, 1, 1, 1, 1])
+        self.assertEqual(items["languages"], [self.first_language.code])
+        self.assertCountEqual(items["valuetypes"], ["prefLabel", "altLabel"])
+        values = items["values"]
+        self.assertEqual(len(values["value"]), 10)
+        first_item_labels = [
+            value
+            for value, position in zip(values["value"], values["item"])
+            if position == 0
+        ]
+        self.assertCountEqual(first_item_labels, ["label0-pref", "label0-alt"])
+
+    def test_get_list_not_modified(self):
+        self.client.force_login(self.admin)
+        url = reverse("controlled_list", kwargs={"list_id": str(self.list1.pk)})
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+
+        # Editing the list changes its revision, and thus its ETag.
+        self.list1.list_items.first().save()
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    @override_settings(LANGUAGES=[("en", "English"), ("de", "German")])
+    def test_list_etags_vary_by_language(self):
+        self.client.force_login(self.admin)
+        urls = [
+            reverse("controlled_lists"),
+            reverse("controlled_list", kwargs={"list_id": str(self.list1.pk)}),
+            reverse("controlled_list_children", kwargs={"list_id": self.list1.pk}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                english = self.client.get(url, headers={"Accept-Language": "en"})
+                german = self.client.get(url, headers={"Accept-Language": "de"})
+                self.assertNotEqual(english.headers["ETag"], german.headers["ETag"])
+
+                # A client switching language is not told its copy is current.
+                response = self.client.get(
+                    url,
+                    headers={
+                        "Accept-Language": "de",
+                        "If-None-Match": english.headers["ETag"],
+                    },
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_get_list_children_paginated(self):
+        self.client.force_login(self.admin)
+        url = reverse("controlled_list_children", kwargs={"list_id": self.list2.pk})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        (root,) = response.json()["items"]
+        self.assertEqual(root["id"], str(self.parent.pk))
+        self.assertEqual(root["child_count"], 4)
+        self.assertIs(root["has_children"], True)
+
+        with self.assertNumQueries(6):
+            # 1: session
+            # 2: auth
+            # 3: SELECT FROM lists
+            # 4: page of children with child counts
+            # 5-6: prefetch values, images (no images: no metadata)
+            response = self.client.get(
+                url, {"parent_id": str(self.parent.pk), "limit": 3}
+            )
+        result = response.json()
+        self.assertEqual([item["sortorder"] for item in result["items"]], [0, 1, 2])
+        self.assertEqual(result["next"], 2)
+        self.assertIs(result["items"][0]["has_children"], False)
+
+        response = self.client.get(
+            url, {"parent_id": str(self.parent.pk), "limit": 3, "after": 2}
+        )
+        result = response.json()
+        self.assertEqual([item["sortorder"] for item in result["items"]], [3])
+        self.assertIsNone(result["next"])
+
+        response = self.client.get(url, {"limit": "zero"})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_get_list_options_batch(self):
+        Graph.objects.filter(pk=self.draft_graph.pk).update(slug="batch_graph")
+        self.client.force_login(self.admin)
+        node_aliases = [
+            self.node_using_list1.alias,
+            self.node_using_list2.alias,
+            "not_a_node",
+        ]
+
+        response = self.client.get(
+            reverse("controlled_list_options_batch"),
+            {"graph_slug": "batch_graph", "node_alias": node_aliases},
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        result = response.json()
+        self.assertEqual(
+            result["nodes"],
+            {
+                self.node_using_list1.alias: str(self.list1.pk),
+                self.node_using_list2.alias: str(self.list2.pk),
+                "not_a_node": None,
+            },
+        )
+        self.assertEqual(len(result["lists"][str(self.list1.pk)]), 5)
+        (root,) = result["lists"][str(self.list2.pk)]
+        self.assertEqual(len(root["children"]), 4)
+
+    def test_get_lean_list_options(self):
+        Graph.objects.filter(pk=self.draft_graph.pk).update(slug="lean_graph")
+        self.client.force_login(self.admin)
+
+        response = self.client.get(
+            reverse("controlled_list_options"),
+            {
+                "graph_slug": "lean_graph",
+                "node_alias": self.node_using_list2.alias,
+                "lean": "true",
+            },
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        (root,) = response.json()
+        self.assertEqual(
+            set(root), {"list_item_id", "uri", "display_value", "sortorder", "children"}
+        )
+        self.assertEqual(root["display_value"], "label0-pref")
+        self.assertEqual(len(root["children"]), 4)
+
+        response = self.client.get(
+            reverse("controlled_list_item_labels", kwargs={"item_id": self.parent.pk})
+        )
+        self.assertEqual(
+            {label["value"] for label in response.json()},
+            {"label0-pref", "label0-alt"},
+        )
+
+    def test_search_list_options(self):
+        Graph.objects.filter(pk=self.draft_graph.pk).update(slug="search_graph")
+        self.client.force_login(self.admin)
+        url = reverse("controlled_list_options_search")
+        params = {
+            "graph_slug": "search_graph",
+            "node_alias": self.node_using_list2.alias,
+            "term": "LABEL3",
+        }
+
+        with self.assertNumQueries(8):
+            # 1: session
+            # 2: auth
+            # 3: SELECT FROM lists
+            # 4: best matching label per item
+            # 5-6: items, prefetch labels
+            # 7: ancestors
+            # 8: display values
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        (result,) = response.json()
+        self.assertEqual(result["matched_value"], "label3-alt")
+        self.assertEqual(result["display_value"], "label3-pref")
+        self.assertEqual(
+            result["ancestors"],
+            [{"list_item_id": str(self.parent.pk), "display_value": "label0-pref"}],
+        )
+
+        response = self.client.get(url, {**params, "language": self.new_language.code})
+        self.assertEqual(response.json(), [])
+
+    def test_get_list_changes(self):
+        self.client.force_login(self.admin)
+        url = reverse("controlled_list_changes", kwargs={"list_id": self.list1.pk})
+        since = List.objects.get(pk=self.list1.pk).revision
+
+        new_item = ListItem.objects.create(
+            list=self.list1, sortorder=5, uri="https://archesproject.org/5"
+        )
+        moved_item = self.list1.list_items.get(sortorder=4)
+        moved_item.parent = new_item
+        moved_item.save()
+        deleted_value = ListItemValue.objects.filter(
+            list_item__list=self.list1, valuetype=self.alt_label
+        ).first()
+        deleted_value_id = str(deleted_value.pk)
+        deleted_value.delete()
+
+        response = self.client.get(url, {"since": since})
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        result = response.json()
+        self.assertEqual(
+            result["revision"], List.objects.get(pk=self.list1.pk).revision
+        )
+        changes = {change["id"]: change for change in result["changes"]}
+        self.assertEqual(changes[str(new_item.pk)]["action"], "insert")
+        self.assertEqual(
+            changes[str(new_item.pk)]["data"]["uri"], "https://archesproject.org/5"
+        )
+        self.assertEqual(changes[str(moved_item.pk)]["action"], "move")
+        self.assertEqual(
+            changes[str(moved_item.pk)]["data"]["parent_id"], str(new_item.pk)
+        )
+        self.assertEqual(changes[deleted_value_id]["action"], "delete")
+        self.assertIsNone(changes[deleted_value_id]["data"])
+
+        response = self.client.get(url, {"since": result["revision"]})
+        self.assertEqual(response.json()["changes"], [])
+
+    def test_get_list_changes_item_moved_to_another_list(self):
+        self.client.force_login(self.admin)
+        since = List.objects.get(pk=self.list1.pk).revision
+        item = self.list1.list_items.get(sortorder=4)
+        item.list = self.list2
+        item.sortorder = 1
+        item.save()
+
+        for lst, action in [(self.list1, "delete"), (self.list2, "move")]:
+            url = reverse("controlled_list_changes", kwargs={"list_id": lst.pk})
+            response = self.client.get(url, {"since": since})
+            changes = {change["id"]: change for change in response.json()["changes"]}
+            self.assertEqual(changes[str(item.pk)]["action"], action)
+        self.assertEqual(changes[str(item.pk)]["data"]["list_id"], str(self.list2.pk))
+
+    def test_get_list_changes_reset_after_recreation(self):
+        self.client.force_login(self.admin)
+        lst = List.objects.create(name="Recreated")
+        ListItem.objects.create(list=lst, sortorder=0, uri="https://example.com/old")
+        list_id = lst.pk
+        since = List.objects.get(pk=list_id).revision
+        lst.delete()
+        (recreated,) = List.objects.bulk_create([List(id=list_id, name="Recreated")])
+        new_item = ListItem.objects.create(
+            list=recreated, sortorder=0, uri="https://example.com/new"
+        )
+
+        url = reverse("controlled_list_changes", kwargs={"list_id": list_id})
+        response = self.client.get(url, {"since": since})
+        result = response.json()
+        self.assertIs(result["reset"], True)
+        changes = {change["id"]: change for change in result["changes"]}
+        self.assertEqual(set(changes), {str(list_id), str(new_item.pk)})
+        self.assertEqual(changes[str(list_id)]["action"], "insert")
+        self.assertEqual(result["revision"], List.objects.get(pk=list_id).revision)
+
     def test_get_list_permitted_nodegroups(self):
         assign_perm("no_access_to_nodegroup", self.rdm_user, self.nodegroup)
 
@@ -276,6 +599,15 @@ class ListTests(TestCase):
         self.assertEqual(new_list_item_values.count(), 21)
 
     def test_export_skos_post(self):
+        self.client.force_login(self.anonymous)
+        with self.assertLogs("django.request", level="WARNING"):
+            response = self.client.post(
+                reverse("controlled_list_export"),
+                {"list_ids": [str(self.list1.pk)]},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN, response.content)
+
         self.client.force_login(self.admin)
         response = self.client.post(
             reverse("controlled_list_export"),